@@ -0,0 +1,67 @@
+"""Time diffing two versions of a synthetic model.
+
+Usage:
+
+    python benchmarks/bench_diff.py --size 1000000 --changes 1000
+
+The new version changes, moves, removes and adds `--changes` elements
+each. It is diffed with shared unchanged data, with copied data, and with
+the hashes of both versions already known.
+"""
+import argparse
+
+from time import perf_counter
+
+from synthetic import make_elements
+
+from pymbe.diff import diff_models, hash_elements
+
+
+def make_versions(size: int, changes: int):
+    old = {data["@id"]: data for data in make_elements(size)}
+    new = dict(old)
+    ids = [id_ for id_, data in old.items() if data["owner"]]
+    step = len(ids) // (3 * changes)
+    for index in range(changes):
+        changed, moved, removed = ids[3 * step * index:][:3 * step:step]
+        new[changed] = dict(old[changed], name="changed")
+        new[moved] = dict(old[moved], owner={"@id": ids[0]})
+        del new[removed]
+        new[f"added {index}"] = dict(old[changed], **{"@id": f"added {index}"})
+    return old, new
+
+
+def timed(function, *args, **kwargs):
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    return result, perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--changes", type=int, default=1_000)
+    args = parser.parse_args()
+
+    old, new = make_versions(args.size, args.changes)
+    diff, shared = timed(diff_models, old, new)
+    print(
+        f"{len(diff.added):,d} added, {len(diff.removed):,d} removed, "
+        f"{len(diff.changed):,d} changed, {len(diff.moved):,d} moved"
+    )
+
+    old_hashes, hashing = timed(hash_elements, old)
+    new = {id_: dict(data) for id_, data in new.items()}
+    new_hashes = {}
+    hashes = dict(old_hashes=old_hashes, new_hashes=new_hashes)
+    _, copied = timed(diff_models, old, new, **hashes)
+    _, hashed = timed(diff_models, old, new, **hashes)
+
+    print(f"{'shared data':>24} {shared:>8.2f}s")
+    print(f"{'hashing one version':>24} {hashing:>8.2f}s")
+    print(f"{'copied data':>24} {copied:>8.2f}s")
+    print(f"{'hashes known':>24} {hashed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Compare downloading elements one request at a time and with the pooled,
+concurrent downloader.
+
+Usage:
+
+    python benchmarks/bench_download.py --size 100000 --latency 0.02
+
+A local stub of the API server serves a synthetic commit, with `--latency`
+seconds of delay on every request and again on every new connection (as a
+stand-in for the TCP and TLS handshakes).  The stub runs in the same
+process, so it answers from responses encoded ahead of time, to leave the
+CPU to the client.  Two workloads are timed:
+
+- loading the whole commit, page by page, into a Model: with a new
+  connection per request and one page after the other, as the client
+  used to, and with the downloader, which keeps its connections alive
+  and requests the next page while the current one is being loaded;
+- looking up `--lookups` elements by id, with a new connection per
+  request, and with the downloader at each of the `--concurrency` limits.
+"""
+import argparse
+import json
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from threading import Thread
+from time import perf_counter, sleep
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+from synthetic import make_elements
+
+from pymbe.download import Downloader
+from pymbe.model import Model
+
+ELEMENTS_PATH = "/projects/project/commits/commit/elements"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_):
+        pass
+
+    def setup(self):
+        super().setup()
+        sleep(self.server.latency)
+
+    def do_GET(self):
+        sleep(self.server.latency)
+        if self.path not in self.server.responses:
+            self.server.responses[self.path] = self.respond()
+        body, headers = self.server.responses[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond(self):
+        url = urlparse(self.path)
+        elements, positions = self.server.elements, self.server.positions
+        headers = {}
+        if url.path.startswith(ELEMENTS_PATH + "/"):
+            data = elements[positions[url.path[len(ELEMENTS_PATH) + 1:]]]
+        else:
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            size = int(query["page[size]"])
+            start = positions[query["page[after]"]] + 1 if "page[after]" in query else 0
+            data = elements[start:start + size]
+            if start + size < len(elements):
+                query["page[after]"] = data[-1]["@id"]
+                next_url = f"{self.server.url}{url.path}?{urlencode(query)}"
+                headers["Link"] = f'<{next_url}>; rel="next"'
+        return json.dumps(data).encode(), headers
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, elements, latency: float):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.elements = elements
+        self.positions = {
+            element["@id"]: index for index, element in enumerate(elements)
+        }
+        self.latency = latency
+        self.responses = {}
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        Thread(target=self.serve_forever, daemon=True).start()
+
+
+def get_without_session(url: str):
+    response = requests.get(url)
+    return response.json(), response.links.get("next", {}).get("url")
+
+
+def iter_pages_in_turn(url: str):
+    while url:
+        page, url = get_without_session(url)
+        yield page
+
+
+def timed(function, *args):
+    start = perf_counter()
+    result = function(*args)
+    return result, perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=5_000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    args = parser.parse_args()
+
+    server = StubServer(list(make_elements(args.size)), latency=args.latency)
+    url = f"{server.url}{ELEMENTS_PATH}?page[size]={args.page_size}"
+    step = len(server.elements) // args.lookups
+    element_ids = [element["@id"] for element in server.elements[::step]]
+
+    # encode the responses ahead of time
+    latency, server.latency = server.latency, 0
+    for _ in iter_pages_in_turn(url):
+        pass
+    for id_ in element_ids:
+        get_without_session(f"{server.url}{ELEMENTS_PATH}/{id_}")
+    server.latency = latency
+
+    print(
+        f"{'workload':>10} {'requests':>9} {'mode':>24} "
+        f"{'time (s)':>9} {'elements/s':>11}"
+    )
+
+    def report(workload, count, mode, seconds, elements):
+        print(
+            f"{workload:>10} {count:>9,d} {mode:>24} "
+            f"{seconds:>9.2f} {elements / seconds:>11,.0f}"
+        )
+
+    pages = -(-args.size // args.page_size)
+    model, seconds = timed(
+        lambda: Model(elements=chain.from_iterable(iter_pages_in_turn(url)))
+    )
+    report("commit", pages, "new connections, in turn", seconds, len(model.elements))
+    downloader = Downloader()
+    model, seconds = timed(
+        lambda: Model(elements=chain.from_iterable(downloader.iter_pages(url)))
+    )
+    report("commit", pages, "pooled, next page ahead", seconds, len(model.elements))
+    downloader.close()
+
+    urls = [f"{server.url}{ELEMENTS_PATH}/{id_}" for id_ in element_ids]
+    _, seconds = timed(lambda: [get_without_session(url) for url in urls])
+    report("lookups", len(urls), "new connections, in turn", seconds, len(urls))
+    for concurrency in args.concurrency:
+        downloader = Downloader(concurrency=concurrency)
+        _, seconds = timed(downloader.map, downloader.get, urls)
+        mode = f"pooled, {concurrency} at a time"
+        report("lookups", len(urls), mode, seconds, len(urls))
+        downloader.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Compare garbage collection pauses with and without a gc-frozen model.
+
+Usage:
+
+    python benchmarks/bench_gc.py --sizes 100000 1000000
+
+For each size, a synthetic model is loaded, either as usual or with
+`gc_frozen=True`, and then a playbook-like run makes instances of every
+part definition and sequences of them for every part usage, as the first
+phases of the random generator playbook do.  The pauses of every garbage
+collection during the run are timed with `gc.callbacks`.
+
+Each measurement runs in a fresh interpreter.
+"""
+import argparse
+import gc
+import json
+import subprocess
+import sys
+
+from time import perf_counter
+
+from synthetic import make_elements
+
+MODES = ("default", "gc frozen")
+
+
+class PauseTimer:
+    """Time the pauses of the garbage collector, by generation"""
+
+    def __init__(self):
+        self.pauses = []
+        self._start = None
+
+    def __call__(self, phase: str, info: dict):
+        if phase == "start":
+            self._start = perf_counter()
+        else:
+            self.pauses.append((info["generation"], perf_counter() - self._start))
+
+
+def run_playbook(model) -> dict:
+    """Make instances of the part definitions and sequences of them for the
+    part usages
+    """
+    from pymbe.interpretation.set_builders import create_set_with_new_instances
+
+    instances = {
+        definition._id: create_set_with_new_instances(
+            sequence_template=[definition],
+            quantities=[3],
+        )
+        for definition in model.ownedMetatype["PartDefinition"]
+    }
+    sequences = {}
+    for usage in model.ownedMetatype["PartUsage"]:
+        owner, (part_type,) = usage.owner, usage.type
+        sequences[usage._id] = [
+            [*owner_sequence, *type_sequence]
+            for owner_sequence in instances[owner._id]
+            for type_sequence in instances[part_type._id]
+        ]
+    return sequences
+
+
+def measure(size: int, mode: str) -> dict:
+    from pymbe.model import Model
+
+    elements = list(make_elements(size))
+    start = perf_counter()
+    model = Model.load(elements, gc_frozen=mode == "gc frozen")
+    load_seconds = perf_counter() - start
+
+    timer = PauseTimer()
+    gc.callbacks.append(timer)
+    start = perf_counter()
+    run_playbook(model)
+    playbook_seconds = perf_counter() - start
+    gc.callbacks.remove(timer)
+
+    pauses = [seconds for _, seconds in timer.pauses]
+    return dict(
+        load_seconds=load_seconds,
+        playbook_seconds=playbook_seconds,
+        collections=len(pauses),
+        full_collections=sum(generation == 2 for generation, _ in timer.pauses),
+        pause_seconds=sum(pauses),
+        longest_pause_ms=max(pauses, default=0) * 1e3,
+    )
+
+
+def run(sizes):
+    rows = []
+    for size in sizes:
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", str(size), mode],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            rows += [dict(size=size, mode=mode, **json.loads(output))]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument(
+        "--measure", nargs=2, metavar=("SIZE", "MODE"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.measure:
+        size, mode = args.measure
+        print(json.dumps(measure(int(size), mode)))
+        return
+
+    print(
+        f"{'size':>10} {'mode':>10} {'load (s)':>9} {'run (s)':>8} {'GCs':>6} "
+        f"{'full GCs':>9} {'paused (s)':>11} {'longest (ms)':>13}"
+    )
+    for row in run(args.sizes):
+        print(
+            f"{row['size']:>10,d} {row['mode']:>10} {row['load_seconds']:>9.2f} "
+            f"{row['playbook_seconds']:>8.2f} {row['collections']:>6,d} "
+            f"{row['full_collections']:>9,d} {row['pause_seconds']:>11.2f} "
+            f"{row['longest_pause_ms']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
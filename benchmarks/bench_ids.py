@@ -0,0 +1,139 @@
+"""Compare UUID string and dense integer element ids as keys.
+
+Usage:
+
+    python benchmarks/bench_ids.py --sizes 10000 100000
+
+For each size, this measures:
+
+* hashing: building and looking up dicts keyed by every element id,
+  both for freshly decoded ids (whose hashes are not cached yet) and for
+  the ids already hashed by the model, vs the integer codes, and a list
+  indexed by the codes;
+* the LPG build: the networkx graph that `SysML2LabeledPropertyGraph`
+  builds, with the ids or the codes as node keys;
+* the playbook: a dict of instance sequences per element, as the
+  interpretation playbooks build, keyed by the ids or the codes.
+
+Memory is measured with tracemalloc, which also slows the code down, so
+times are measured in separate runs.
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from time import perf_counter
+
+import networkx as nx
+
+from synthetic import make_elements
+
+from pymbe.model import Model
+
+
+def timed(function, *args) -> float:
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+
+def traced(function, *args) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def build_and_look_up(keys: list) -> dict:
+    table = {key: index for index, key in enumerate(keys)}
+    for key in keys:
+        table[key]
+    return table
+
+
+def build_and_index(codes: list) -> list:
+    table = [None] * len(codes)
+    for index, code in enumerate(codes):
+        table[code] = index
+    for code in codes:
+        table[code]
+    return table
+
+
+def build_graph(model: Model, key) -> nx.MultiDiGraph:
+    """Build the nodes and edges of the LPG, keyed by `key(id)`"""
+    relationships = [
+        relationship
+        for relationship in model.all_relationships.values()
+        if "isAbstract" not in relationship._data
+    ]
+    graph = nx.MultiDiGraph()
+    graph.add_nodes_from(
+        (key(id_), element._data)
+        for id_, element in model.all_non_relationships.items()
+    )
+    graph.add_edges_from(
+        (
+            key(source["@id"]),
+            key(target["@id"]),
+            relationship._metatype,
+            relationship._data,
+        )
+        for relationship in relationships
+        for source in relationship._data["source"]
+        for target in relationship._data["target"]
+    )
+    return graph
+
+
+def build_instances(keys: list) -> dict:
+    """Build a dict of instance sequences per element, like the playbooks"""
+    return {key: [(key, index) for index in range(3)] for key in keys}
+
+
+def measure(size: int) -> dict:
+    model = Model(elements=list(make_elements(size)))
+    encoder = model.id_encoder
+    ids = list(model.elements)
+    codes = encoder.encode_all(ids)
+
+    def fresh_ids():
+        # decoded ids are new strings whose hashes have not been computed yet
+        return json.loads(json.dumps(ids))
+
+    def identity(id_):
+        return id_
+
+    fresh = fresh_ids()
+    return {
+        "dict, fresh ids (s)": timed(build_and_look_up, fresh),
+        "dict, hashed ids (s)": timed(build_and_look_up, ids),
+        "dict, codes (s)": timed(build_and_look_up, codes),
+        "list, codes (s)": timed(build_and_index, codes),
+        "graph, ids (s)": timed(build_graph, model, identity),
+        "graph, codes (s)": timed(build_graph, model, encoder.encode),
+        "graph, ids (MB)": traced(build_graph, model, identity) / 1e6,
+        "graph, codes (MB)": traced(build_graph, model, encoder.encode) / 1e6,
+        "instances, fresh ids (MB)": traced(lambda: build_instances(fresh_ids())) / 1e6,
+        "instances, codes (MB)": traced(build_instances, codes) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    rows = {size: measure(size) for size in args.sizes}
+    print(f"{'':>26}" + "".join(f"{size:>12,d}" for size in rows))
+    for name in next(iter(rows.values())):
+        print(f"{name:>26}" + "".join(f"{row[name]:>12.3f}" for row in rows.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare peak memory and wall time of the Model loading paths.
+
+Usage:
+
+    python benchmarks/bench_load.py --sizes 100000 1000000
+
+Each measurement runs in a fresh interpreter, so the peak resident set
+size (RSS) reported belongs to that load alone.  The parallel mode scans
+the elements with a process per CPU, whose memory is not included.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+from time import perf_counter
+
+from synthetic import write_elements
+
+
+MODES = ("eager", "stream", "parallel")
+
+
+def measure(filepath: str, mode: str) -> dict:
+    import resource
+
+    from pymbe.model import Model
+
+    start = perf_counter()
+    model = Model.load_from_file(
+        filepath,
+        stream=mode == "stream",
+        processes=os.cpu_count() if mode == "parallel" else None,
+    )
+    elapsed = perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return dict(
+        elements=len(model.elements),
+        seconds=round(elapsed, 2),
+        peak_rss_mb=round(peak_kb / 1024, 1),
+    )
+
+
+def run(sizes, suffix: str = ".json"):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            filepath = write_elements(Path(tmp_dir) / f"model_{size}{suffix}", size)
+            for mode in MODES:
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", str(filepath), mode],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                rows += [dict(size=size, mode=mode, **json.loads(output))]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument("--suffix", default=".json", choices=(".json", ".gz", ".xz"))
+    parser.add_argument(
+        "--measure", nargs=2, metavar=("FILE", "MODE"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    print(f"{'size':>10} {'mode':>8} {'seconds':>9} {'peak RSS (MB)':>14}")
+    for row in run(args.sizes, suffix=args.suffix):
+        print(
+            f"{row['size']:>10,d} {row['mode']:>8} "
+            f"{row['seconds']:>9.2f} {row['peak_rss_mb']:>14,.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
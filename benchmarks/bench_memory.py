@@ -0,0 +1,65 @@
+"""Measure the memory used per element by a loaded Model.
+
+Usage:
+
+    python benchmarks/bench_memory.py --sizes 10000 100000
+
+The element data is decoded from a single JSON document, as
+`Model.load_from_file` does, and the memory is traced with tracemalloc.
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from synthetic import make_elements
+
+
+def measure(size: int) -> dict:
+    from pymbe.model import Model
+
+    text = json.dumps(list(make_elements(size)))
+
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(text)
+    decoded, _ = tracemalloc.get_traced_memory()
+
+    model = Model.load(data)
+    del data
+    gc.collect()
+    loaded, _ = tracemalloc.get_traced_memory()
+
+    model.freeze()
+    gc.collect()
+    frozen, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(model.elements)
+    return dict(
+        size=count,
+        data_bytes=decoded / count,
+        model_bytes=loaded / count,
+        frozen_bytes=frozen / count,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>10} {'decoded data (B/element)':>25} "
+        f"{'model (B/element)':>18} {'frozen (B/element)':>19}"
+    )
+    for size in args.sizes:
+        row = measure(size)
+        print(
+            f"{row['size']:>10,d} {row['data_bytes']:>25,.0f} "
+            f"{row['model_bytes']:>18,.0f} {row['frozen_bytes']:>19,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
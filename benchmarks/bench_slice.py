@@ -0,0 +1,53 @@
+"""Time slicing a synthetic model and building the LPG of the slices.
+
+Usage:
+
+    python benchmarks/bench_slice.py --size 100000
+
+Each part definition of the synthetic model references the earlier ones
+through the types of its usages, so slicing from later definitions gives
+bigger slices.  The LPG of the whole model is built for comparison.
+"""
+import argparse
+
+from time import perf_counter
+
+from synthetic import make_elements
+
+from pymbe.graph import SysML2LabeledPropertyGraph
+from pymbe.model import Model
+
+
+def timed(function, *args, **kwargs):
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    return result, perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument(
+        "--fractions", nargs="+", type=float, default=[0.001, 0.01, 0.1, 1.0]
+    )
+    args = parser.parse_args()
+
+    model = Model(elements=list(make_elements(args.size)))
+    definitions = model.ownedMetatype["PartDefinition"]
+
+    print(f"{'root':>8} {'elements':>10} {'slice (s)':>10} {'LPG (s)':>8}")
+    for fraction in args.fractions:
+        index = min(int(fraction * len(definitions)), len(definitions) - 1)
+        sliced, slicing = timed(model.slice, [definitions[index]])
+        _, building = timed(SysML2LabeledPropertyGraph, model=sliced)
+        print(
+            f"{index:>8,d} {len(sliced.elements):>10,d} "
+            f"{slicing:>10.3f} {building:>8.3f}"
+        )
+
+    _, building = timed(SysML2LabeledPropertyGraph, model=model)
+    print(f"{'whole':>8} {len(model.elements):>10,d} {'':>10} {building:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compare reloading a Model from a snapshot against loading it from JSON.
+
+Usage:
+
+    python benchmarks/bench_snapshot.py --sizes 100000 1000000
+
+Each measurement runs in a fresh interpreter.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+from time import perf_counter
+
+from synthetic import write_elements
+
+
+def measure(filepath: str, mode: str) -> dict:
+    import resource
+
+    from pymbe.model import Model
+
+    start = perf_counter()
+    if mode == "snapshot":
+        model = Model.load_snapshot(filepath)
+    else:
+        model = Model.load_from_file(filepath)
+    elapsed = perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return dict(
+        elements=len(model.elements),
+        seconds=round(elapsed, 2),
+        peak_rss_mb=round(peak_kb / 1024, 1),
+    )
+
+
+def make_snapshot(json_file: str, snapshot_file: str):
+    from pymbe.model import Model
+
+    Model.load_from_file(json_file).save_snapshot(snapshot_file)
+
+
+def run(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            json_file = write_elements(Path(tmp_dir) / f"model_{size}.json", size)
+            snapshot_file = json_file.with_suffix(".snapshot")
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--snapshot",
+                    str(json_file),
+                    str(snapshot_file),
+                ],
+                check=True,
+            )
+            for mode, filepath in (("json", json_file), ("snapshot", snapshot_file)):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", str(filepath), mode],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                rows += [dict(
+                    size=size,
+                    mode=mode,
+                    file_mb=filepath.stat().st_size / 2**20,
+                    **json.loads(output),
+                )]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument(
+        "--measure", nargs=2, metavar=("FILE", "MODE"), help=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--snapshot", nargs=2, metavar=("JSON", "SNAPSHOT"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+    if args.snapshot:
+        make_snapshot(*args.snapshot)
+        return
+
+    print(
+        f"{'size':>10} {'mode':>9} {'file (MB)':>10} "
+        f"{'seconds':>9} {'peak RSS (MB)':>14}"
+    )
+    for row in run(args.sizes):
+        print(
+            f"{row['size']:>10,d} {row['mode']:>9} {row['file_mb']:>10,.1f} "
+            f"{row['seconds']:>9.2f} {row['peak_rss_mb']:>14,.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Synthetic SysML v2 element exports for benchmarking pymbe
+import gzip
+import json
+import lzma
+
+from pathlib import Path
+from random import Random
+from typing import Dict, Iterator, Union
+from uuid import UUID
+
+
+FILLER_KEYS = (
+    "aliasId",
+    "documentation",
+    "documentationComment",
+    "ownedAnnotation",
+    "ownedTextualRepresentation",
+)
+
+OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+}
+
+
+def _ref(id_: str) -> dict:
+    return {"@id": id_}
+
+
+def _element(id_: str, metatype: str, name: str, owner: str = None, **data) -> dict:
+    return {
+        "@id": id_,
+        "@type": metatype,
+        "identifier": id_,
+        "name": name,
+        "qualifiedName": name,
+        "owner": _ref(owner) if owner else None,
+        "ownedElement": [],
+        "ownedRelationship": [],
+        **{key: [] for key in FILLER_KEYS},
+        **data,
+    }
+
+
+def _relationship(id_: str, metatype: str, source: str, target: str, **data) -> dict:
+    return _element(
+        id_,
+        metatype,
+        None,
+        relatedElement=[_ref(source), _ref(target)],
+        source=[_ref(source)],
+        target=[_ref(target)],
+        owningRelatedElement=_ref(source),
+        **data,
+    )
+
+
+def make_elements(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Yield `count` elements of a synthetic parts model.
+
+    The model is made of a root package holding part definitions, each
+    owning a few part usages typed by other part definitions.  Every
+    usage brings its FeatureMembership and FeatureTyping relationships.
+    The root package is yielded last, once all its members are known.
+    """
+    rng = Random(seed)
+
+    def new_id() -> str:
+        return str(UUID(int=rng.getrandbits(128), version=4))
+
+    root = new_id()
+    produced = 1
+
+    definitions = []
+    while produced < count:
+        definition = new_id()
+        definitions.append(definition)
+        produced += 1
+
+        owned = []
+        for index in range(rng.randint(1, 4)):
+            if produced + 3 > count:
+                break
+            usage, membership, typing = new_id(), new_id(), new_id()
+            owned.append((usage, membership))
+            part_type = rng.choice(definitions)
+            yield _element(
+                usage,
+                "PartUsage",
+                f"part {index}",
+                owner=definition,
+                owningRelationship=_ref(membership),
+                type=[_ref(part_type)],
+                ownedRelationship=[_ref(typing)],
+            )
+            yield _relationship(membership, "FeatureMembership", definition, usage)
+            yield _relationship(typing, "FeatureTyping", usage, part_type)
+            produced += 3
+
+        yield _element(
+            definition,
+            "PartDefinition",
+            f"Part {len(definitions)}",
+            owner=root,
+            isAbstract=rng.random() < 0.1,
+            ownedElement=[_ref(usage) for usage, _ in owned],
+            ownedRelationship=[_ref(membership) for _, membership in owned],
+        )
+
+    yield _element(
+        root,
+        "Package",
+        "Root",
+        ownedElement=[_ref(definition) for definition in definitions],
+    )
+
+
+def write_elements(
+    filepath: Union[Path, str],
+    count: int,
+    seed: int = 0,
+    indent: int = 2,
+) -> Path:
+    """Write a synthetic export, compressed if the suffix is .gz or .xz
+
+    The default indentation matches `Model.save_to_file`.
+    """
+    filepath = Path(filepath)
+    opener = OPENERS.get(filepath.suffix, open)
+    with opener(filepath, "wt", encoding="utf-8") as file:
+        file.write("[")
+        for index, element in enumerate(make_elements(count, seed=seed)):
+            if index:
+                file.write(",\n")
+            file.write(json.dumps(element, indent=indent))
+        file.write("]")
+    return filepath
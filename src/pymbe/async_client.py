@@ -0,0 +1,113 @@
+# An asyncio client of the SysML v2 API, for loading many commits at once
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .client import commit_url, make_commit_model, retrieve_commit_page
+from .download import Downloader, RetryPolicy
+from .local.cache import CommitCache
+from .model import Model
+
+
+_DEFAULT_CACHE = object()
+
+
+class AsyncSysML2Client:
+    """Load models of commits from the SysML v2 API with asyncio.
+
+    The requests are made with the same downloader, cache and model
+    construction as `SysML2Client`, in a pool of `max_loads` threads, so
+    the event loop is free while the commits download.  The data of each
+    project, for the names of the models, is kept with its commits in the
+    cache, so the loads of cached commits don't need the server.
+    """
+
+    def __init__(
+        self,
+        host_url: str = "http://localhost",
+        host_port: int = 9000,
+        page_size: int = 5000,
+        max_loads: int = 4,
+        retry_policy: RetryPolicy = None,
+        cache: Optional[CommitCache] = _DEFAULT_CACHE,
+        library: Model = None,
+    ):
+        if max_loads < 1:
+            raise ValueError(f"Cannot load {max_loads} commits at a time!")
+        self.host = f"{host_url}:{host_port}"
+        self.page_size = page_size
+        self.max_loads = max_loads
+        self.cache = CommitCache() if cache is _DEFAULT_CACHE else cache
+        self.library = library
+        self._downloader = Downloader(concurrency=max_loads, retry=retry_policy)
+        self._executor = ThreadPoolExecutor(max_workers=max_loads)
+        self._project_names: Dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        return f"<AsyncSysML2Client ({self.host})>"
+
+    async def __aenter__(self) -> "AsyncSysML2Client":
+        return self
+
+    async def __aexit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._downloader.close()
+
+    async def load_commit(self, project: str, commit: str, name: str = None) -> Model:
+        """Download the elements of a commit, and make a model of them, named
+        after its project, unless it is given a `name`
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(self._load_commit, project, commit, name=name),
+        )
+
+    async def load_commits(
+        self,
+        commits: Iterable[Tuple[str, str]],
+        limit: int = None,
+    ) -> List[Model]:
+        """Load the (project, commit) pairs, up to `limit` at a time, in their order"""
+        if limit is not None and not 1 <= limit <= self.max_loads:
+            raise ValueError(
+                f"Cannot load {limit} commits at a time, with {self.max_loads} threads!"
+            )
+        semaphore = asyncio.Semaphore(limit or self.max_loads)
+
+        async def load(project: str, commit: str) -> Model:
+            async with semaphore:
+                return await self.load_commit(project, commit)
+
+        return await asyncio.gather(
+            *(load(project, commit) for project, commit in commits)
+        )
+
+    def _load_commit(self, project: str, commit: str, name: str = None) -> Model:
+        get = partial(
+            retrieve_commit_page,
+            self._downloader,
+            commit=(self.host, project, commit),
+            cache=self.cache,
+        )
+        if name is None:
+            name = self._project_names.get(project)
+        if name is None:
+            project_data, _ = get(f"{self.host}/projects/{project}")
+            name = self._project_names[project] = project_data.get("name") or project
+        url = (
+            f"{commit_url(self.host, project, commit)}/elements"
+            f"?page[size]={self.page_size}"
+        )
+        return make_commit_model(
+            chain.from_iterable(self._downloader.iter_pages(url, get=get)),
+            name=f"{name} ({self.host})",
+            source=url,
+            library=self.library,
+        )
@@ -1,16 +1,17 @@
 from datetime import timezone
 from dateutil import parser
-from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 from warnings import warn
 
 import ipywidgets as ipyw
-import requests
 import sysml_v2_api_client as sysml2
 import traitlets as trt
 
+from .download import Downloader, RetryPolicy
 from .label import get_label
+from .local.cache import CommitCache
 from .model import Model
 
 
@@ -43,17 +44,61 @@ TIMEZONES = {
 }
 
 
+def commit_url(host: str, project: str, commit: str) -> str:
+    return f"{host}/projects/{project}/commits/{commit}"
+
+
+def retrieve_commit_page(
+    downloader: Downloader,
+    url: str,
+    commit: Tuple[str, str, str],
+    cache: CommitCache = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Get a page of a (host, project, commit), from the cache if it has it"""
+    if cache is None or not all(commit):
+        return downloader.get(url)
+    parsed = urlparse(url)
+    key = (*commit, f"{parsed.path}?{parsed.query}")
+    page = cache.get(key)
+    if page is None:
+        page = downloader.get(url)
+        cache.put(key, *page)
+    return page
+
+
+def make_commit_model(
+    elements: Iterable[Dict],
+    name: str,
+    source: str,
+    library: Model = None,
+) -> Model:
+    """Make a model of the elements of a commit, which may be streamed, e.g.,
+    page by page
+    """
+    model = Model(
+        elements=iter(elements or ()),
+        name=name,
+        source=source,
+        library=library,
+    )
+    for element in model.elements.values():
+        if "label" not in element._derived:
+            element._derived["label"] = get_label(element)
+    return model
+
+
 class SysML2Client(trt.HasTraits):
     """
         A traitleted SysML v2 API Client.
 
-    ..todo:
-        - Add ability to use element download pagination.
-
     """
 
     model: Model = trt.Instance(Model, allow_none=True)
 
+    # A shared model of library elements, for the loaded models to use
+    # instead of their own copies
+    library: Model = trt.Instance(Model, allow_none=True)
+
     host_url = trt.Unicode(
         default_value="http://localhost",
     )
@@ -71,6 +116,20 @@ class SysML2Client(trt.HasTraits):
 
     paginate = trt.Bool(default_value=True)
 
+    # The most requests to make to the server at the same time
+    concurrency = trt.Integer(
+        default_value=4,
+        min=1,
+    )
+
+    # How to retry the requests that fail
+    retry_policy: RetryPolicy = trt.Instance(RetryPolicy, args=())
+
+    _downloader: Downloader = trt.Instance(Downloader)
+
+    # Commits never change, so what is downloaded from them is kept on disk
+    cache: CommitCache = trt.Instance(CommitCache, allow_none=True)
+
     _api_configuration: sysml2.Configuration = trt.Instance(sysml2.Configuration)
     _commits_api: sysml2.CommitApi = trt.Instance(sysml2.CommitApi)
     _elements_api: sysml2.ElementApi = trt.Instance(sysml2.ElementApi)
@@ -87,6 +146,14 @@ class SysML2Client(trt.HasTraits):
 
     name_hints = trt.Dict()
 
+    @trt.default("_downloader")
+    def _make_downloader(self):
+        return Downloader(concurrency=self.concurrency, retry=self.retry_policy)
+
+    @trt.default("cache")
+    def _make_cache(self):
+        return CommitCache()
+
     @trt.default("_api_configuration")
     def _make_api_configuration(self):
         return sysml2.Configuration(host=self.host)
@@ -148,6 +215,12 @@ class SysML2Client(trt.HasTraits):
         if old_api_configuration:
             del old_api_configuration
 
+    @trt.observe("concurrency", "retry_policy")
+    def _update_downloader(self, *_):
+        old_downloader = self._downloader
+        self._downloader = self._make_downloader()
+        old_downloader.close()
+
     @trt.observe("_api_configuration")
     def _update_apis(self, *_):
         for api_type in ("commit", "element", "project"):
@@ -160,17 +233,14 @@ class SysML2Client(trt.HasTraits):
 
     @trt.observe("selected_commit")
     def _update_elements(self, *_, elements=None):
-        elements = elements or []
-        self.model = Model.load(
-            elements=elements,
+        self.model = make_commit_model(
+            elements,
             name=f"""{
                 self.projects[self.selected_project]["name"]
             } ({self.host})""",
             source=self.elements_url,
+            library=self.library,
         )
-        for element in self.model.elements.values():
-            if "label" not in element._derived:
-                element._derived["label"] = get_label(element)
 
     @trt.observe("folder_path")
     def _update_json_files(self, *_):
@@ -182,7 +252,7 @@ class SysML2Client(trt.HasTraits):
         if change is None:
             return
         if change.new != change.old and change.new.exists():
-            self.model = Model.load_from_file(self.json_file)
+            self.model = Model.load_from_file(self.json_file, library=self.library)
 
     @property
     def host(self):
@@ -193,26 +263,36 @@ class SysML2Client(trt.HasTraits):
         if not self.paginate:
             warn(
                 "By default, disabling pagination still retrieves 100 "
-                "records at a time!  True pagination is not supported yet."
+                "records at a time!  The server picks the page size."
             )
-        # TODO: Get the link header and use that to get the next page
-        # NOTE: The Pilot Implementation uses cursor-navigation, a la GitHub and DynamoDB
+        # NOTE: The Pilot Implementation uses cursor-navigation, a la GitHub and
+        #       DynamoDB, the URL of the next page is in the Link header of each page
+        url = commit_url(self.host, self.selected_project, self.selected_commit)
+        return f"{url}/elements" + (
+            f"?page[size]={self.page_size}" if self.paginate else ""
+        )
+
+    def element_url(self, element_id: str) -> str:
         return (
-            f"{self.host}/"
-            f"projects/{self.selected_project}/"
-            f"commits/{self.selected_commit}/"
-            f"elements"
-        ) + (f"?page[size]={self.page_size}" if self.paginate else "")
+            f"{commit_url(self.host, self.selected_project, self.selected_commit)}/"
+            f"elements/{element_id}"
+        )
+
+    def _retrieve_page(self, url: str) -> Tuple[List[Dict], Optional[str]]:
+        """Get the data at a URL, and the URL of the next page, if there is one"""
+        return retrieve_commit_page(
+            self._downloader,
+            url,
+            commit=(self.host, self.selected_project, self.selected_commit),
+            cache=self.cache,
+        )
 
-    @lru_cache
     def _retrieve_data(self, url: str) -> dict:
-        response = requests.get(url)
-        if not response.ok:
-            raise requests.HTTPError(
-                f"Failed to retrieve elements from '{url}', "
-                f"reason: {response.reason}"
-            )
-        return response.json()
+        return self._retrieve_page(url)[0]
+
+    def _iter_pages(self, url: str) -> Iterator[List[Dict]]:
+        """Follow the `next` links from a URL, one page at a time"""
+        return self._downloader.iter_pages(url, get=self._retrieve_page)
 
     def _get_project_commits(self):
         # TODO: add more info about the commit when API provides it
@@ -223,15 +303,27 @@ class SysML2Client(trt.HasTraits):
             )
         ]
 
+    def _iter_elements_from_server(self) -> Iterator[Dict]:
+        for page in self._iter_pages(self.elements_url):
+            yield from page
+
     def _get_elements_from_server(self):
-        return self._retrieve_data(self.elements_url)
+        return list(self._iter_elements_from_server())
+
+    def _get_elements_by_id(self, element_ids: Iterable[str]) -> List[Dict]:
+        """Look up elements one by one, `concurrency` at a time, in the order of
+        their ids
+        """
+        return self._downloader.map(
+            self._retrieve_data,
+            map(self.element_url, element_ids),
+        )
 
     def _download_elements(self):
-        elements = self._get_elements_from_server()
-        max_elements = self.page_size if self.paginate else 100
-        if len(elements) == max_elements:
-            warn("There are probably more elements that were not retrieved!")
-        self._update_elements(elements=elements)
+        # the elements are wrapped as each page arrives, and every page is
+        # kept in the cache as soon as it is downloaded, so when a download
+        # fails part-way, the next one only requests the pages after it
+        self._update_elements(elements=self._iter_elements_from_server())
 
     def _load_from_file(self, file_path: Union[str, Path]):
-        self.model = Model.load_from_file(file_path)
+        self.model = Model.load_from_file(file_path, library=self.library)
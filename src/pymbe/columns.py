@@ -0,0 +1,123 @@
+# Columnar tables of element attributes, for vectorized queries over a whole model
+from math import inf, nan
+from typing import Dict
+
+import numpy as np
+
+from .model import Element, Model, get_owner_id
+
+
+COLUMNS = (
+    "index",
+    "metatype",
+    "owner",
+    "name",
+    "isAbstract",
+    "lower",
+    "upper",
+    "type",
+)
+
+
+def model_columns(model: Model) -> Dict[str, np.ndarray]:
+    """Make a column of each element attribute, in the order of `model.elements`.
+
+    Elements are referenced by their `model.id_encoder` codes, with -1 for
+    no element, and metatypes by their index in `sorted(model.ownedMetatype)`.
+    The multiplicity bounds are floats, with `inf` for an unbounded upper
+    bound and `nan` where there is no multiplicity.
+    """
+    elements = model.elements
+    encode = model.id_encoder.encode
+    metatype_codes = {
+        metatype: code
+        for code, metatype in enumerate(sorted(model.ownedMetatype))
+    }
+
+    indices, metatypes, owners, names, abstracts = [], [], [], [], []
+    lowers, uppers, types = [], [], []
+    for id_, element in elements.items():
+        data = element._data
+        indices.append(encode(id_))
+        metatypes.append(metatype_codes[data["@type"]])
+        owner_id = get_owner_id(data)
+        owners.append(-1 if owner_id is None else encode(owner_id))
+        names.append(data.get("name"))
+        abstracts.append(element._is_abstract)
+
+        lower, upper = multiplicity_bounds(data, elements)
+        lowers.append(lower)
+        uppers.append(upper)
+
+        type_id = _first_reference(data.get("type"))
+        types.append(-1 if type_id is None else encode(type_id))
+
+    return dict(
+        index=np.array(indices, dtype=np.int64),
+        metatype=np.array(metatypes, dtype=np.int32),
+        owner=np.array(owners, dtype=np.int64),
+        name=np.array(names, dtype=object),
+        isAbstract=np.array(abstracts, dtype=bool),
+        lower=np.array(lowers, dtype=np.float64),
+        upper=np.array(uppers, dtype=np.float64),
+        type=np.array(types, dtype=np.int64),
+    )
+
+
+def model_frame(model: Model):
+    """Make a pandas DataFrame of the element attribute columns, indexed by
+    element code, with the metatypes as categories
+    """
+    try:
+        import pandas as pd
+    except ImportError as exc:
+        raise ImportError("pandas is needed to make a DataFrame of a model!") from exc
+
+    columns = model_columns(model)
+    columns["metatype"] = pd.Categorical.from_codes(
+        columns["metatype"],
+        categories=sorted(model.ownedMetatype),
+    )
+    return pd.DataFrame(columns, columns=COLUMNS).set_index("index")
+
+
+def multiplicity_bounds(data: dict, elements: Dict[str, Element]) -> tuple:
+    """Get the (lower, upper) bounds of the multiplicity of an element.
+
+    As in `feature_multiplicity`, a missing lower bound is the upper bound.
+    """
+    multiplicity = _get_referenced(data.get("multiplicity"), elements)
+    if multiplicity is None:
+        return nan, nan
+    upper = _bound_value(multiplicity.get("upperBound"), elements)
+    lower = _bound_value(multiplicity.get("lowerBound"), elements)
+    if multiplicity.get("lowerBound") is None:
+        lower = upper
+    return lower, upper
+
+
+def _bound_value(reference: dict, elements: Dict[str, Element]) -> float:
+    literal = _get_referenced(reference, elements)
+    if literal is None:
+        return nan
+    value = literal.get("value")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if value == "*" or literal["@type"] == "LiteralInfinity":
+        return inf
+    return nan
+
+
+def _get_referenced(reference: dict, elements: Dict[str, Element]) -> dict:
+    """Get the data of a referenced element, if it is in the model"""
+    id_ = _first_reference(reference)
+    element = None if id_ is None else elements.get(id_)
+    return None if element is None else element._data
+
+
+def _first_reference(references) -> str:
+    if isinstance(references, (list, tuple)):
+        references = references[0] if references else None
+    if isinstance(references, dict):
+        return references.get("@id")
+    return None
@@ -0,0 +1,144 @@
+# Find what changed between two versions (e.g., commits) of a model
+import json
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Any, Dict, List, Tuple, Union
+
+from .model import Element, Model, get_owner_id
+
+
+DIGEST_SIZE = 16
+
+# sorted keys and no whitespace, so equal data always gives the same text
+CANONICAL_ENCODER = json.JSONEncoder(
+    check_circular=False,
+    separators=(",", ":"),
+    sort_keys=True,
+)
+
+
+@dataclass
+class ModelDiff:
+    """The elements added, removed, changed or moved to another owner"""
+
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    # the old and new owner ids of the moved elements
+    moved: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    # the old and new values of the attributes of the changed and moved elements
+    attributes: Dict[str, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.moved)
+
+
+def hash_data(data: dict) -> bytes:
+    """Hash the canonical JSON form of some element data"""
+    return blake2b(
+        CANONICAL_ENCODER.encode(data).encode("utf-8"),
+        digest_size=DIGEST_SIZE,
+    ).digest()
+
+
+def hash_subtree(content_hash: bytes, owned_hashes: List[bytes]) -> bytes:
+    """Combine the content hash of an element with the subtree hashes of its
+    owned elements, in any order
+    """
+    return blake2b(
+        b"".join([content_hash, *sorted(owned_hashes)]),
+        digest_size=DIGEST_SIZE,
+    ).digest()
+
+
+def hash_elements(elements: Union[Model, Mapping]) -> Dict[str, bytes]:
+    """Hash the data of every element in a model, or a mapping of ids to
+    elements or element data
+    """
+    return {
+        id_: hash_data(data)
+        for id_, data in _get_data(elements).items()
+    }
+
+
+def diff_attributes(old: dict, new: dict) -> Dict[str, Tuple[Any, Any]]:
+    """Get the old and new values of the attributes that differ, with
+    None for a missing attribute
+    """
+    return {
+        key: (old.get(key), new.get(key))
+        for key in {**old, **new}
+        if old.get(key) != new.get(key)
+    }
+
+
+def diff_models(
+    old: Union[Model, Mapping],
+    new: Union[Model, Mapping],
+    old_hashes: Dict[str, bytes] = None,
+    new_hashes: Dict[str, bytes] = None,
+) -> ModelDiff:
+    """Find what changed between two versions of a model.
+
+    Elements are compared by the hashes of their data, and only the
+    elements whose hashes differ are compared attribute by attribute.
+    Hashes missing from `old_hashes` and `new_hashes` are added to them, so
+    they can be reused when diffing against other versions.
+
+    NOTE: By default, the hashes of a `Model` are its content hashes, so
+          diffing it fills in the content hashes of its elements (see
+          `Element._content_hash`) as a side effect.  Pass dicts of hashes
+          to leave the models as they are.
+    """
+    old_hashes = _get_hashes(old, old_hashes)
+    new_hashes = _get_hashes(new, new_hashes)
+    old, new = _get_data(old), _get_data(new)
+
+    diff = ModelDiff(removed=[id_ for id_ in old if id_ not in new])
+    for id_, new_data in new.items():
+        old_data = old.get(id_)
+        if old_data is None:
+            diff.added.append(id_)
+            continue
+        # the versions may share the data of unchanged elements
+        if old_data is new_data:
+            continue
+
+        old_digest = old_hashes.get(id_)
+        if old_digest is None:
+            old_digest = old_hashes[id_] = hash_data(old_data)
+        new_digest = new_hashes.get(id_)
+        if new_digest is None:
+            new_digest = new_hashes[id_] = hash_data(new_data)
+        if old_digest == new_digest:
+            continue
+
+        old_owner, new_owner = get_owner_id(old_data), get_owner_id(new_data)
+        if old_owner == new_owner:
+            diff.changed.append(id_)
+        else:
+            diff.moved[id_] = old_owner, new_owner
+        diff.attributes[id_] = diff_attributes(old_data, new_data)
+    return diff
+
+
+def _get_hashes(elements: Union[Model, Mapping], hashes: Dict[str, bytes] = None):
+    if hashes is not None:
+        return hashes
+    if isinstance(elements, Model):
+        return elements._content_hashes
+    return {}
+
+
+def _get_data(elements: Union[Model, Mapping]) -> Mapping:
+    if isinstance(elements, Model):
+        elements = elements.elements
+    if not elements:
+        return {}
+    if isinstance(next(iter(elements.values())), Element):
+        return {id_: element._data for id_, element in elements.items()}
+    return elements
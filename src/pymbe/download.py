@@ -0,0 +1,167 @@
+# Concurrent downloads from the SysML v2 API, over a pool of kept-alive connections
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from random import uniform
+from threading import Lock
+from time import sleep, time
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+
+Page = Tuple[List[Dict], Optional[str]]
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How many times to try a request, and how long to wait in between.
+
+    The waits grow exponentially from `backoff` seconds, up to
+    `max_backoff`, and are picked at random up to that limit (full jitter),
+    so many clients don't retry in lockstep.  A `Retry-After` from the server
+    is waited out instead, and if it is longer than `max_backoff`, the
+    request is not tried again.
+    """
+
+    attempts: int = 5
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    timeout: Optional[float] = 60.0
+    statuses: FrozenSet[int] = RETRY_STATUSES
+
+    def __post_init__(self):
+        if self.attempts < 1:
+            raise ValueError(f"Cannot try a request {self.attempts} times!")
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("Cannot wait for a negative time between attempts!")
+
+    def wait(self, attempt: int, retry_after: str = None) -> Optional[float]:
+        """How long to wait after the failure of attempt number `attempt` (from 0),
+        or None if the server asks to wait longer than `max_backoff`
+        """
+        seconds = parse_retry_after(retry_after)
+        if seconds is None:
+            return uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        return seconds if seconds <= self.max_backoff else None
+
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    """The seconds to wait for a `Retry-After` of seconds or an HTTP date"""
+    if retry_after is None:
+        return None
+    try:
+        seconds = float(retry_after)
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        # HTTP dates are in GMT, even the ones that don't say so
+        seconds = date.replace(tzinfo=date.tzinfo or timezone.utc).timestamp() - time()
+    return max(seconds, 0.0)
+
+
+class Downloader:
+    """Get JSON data from the API, `concurrency` requests at a time.
+
+    The requests share one `requests.Session`, whose connection pool is
+    sized for the concurrency, so connections are kept alive and reused
+    instead of being opened for every request.  Failed requests are tried
+    again, following the `retry` policy.
+    """
+
+    def __init__(self, concurrency: int = 4, retry: RetryPolicy = None):
+        if concurrency < 1:
+            raise ValueError(f"Cannot download with a concurrency of {concurrency}!")
+        self.concurrency = concurrency
+        self.retry = retry or RetryPolicy()
+        self._session = None
+        self._lock = Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.concurrency,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def get(self, url: str) -> Page:
+        """Get the data at a URL, and the URL of the next page, if there is one"""
+        retry = self.retry
+        for attempt in range(retry.attempts):
+            retry_after = None
+            try:
+                response = self.session.get(url, timeout=retry.timeout)
+                if response.ok:
+                    return response.json(), response.links.get("next", {}).get("url")
+                reason = response.reason
+                if response.status_code not in retry.statuses:
+                    break
+                retry_after = response.headers.get("Retry-After")
+            # connection errors, timeouts and incomplete or garbled responses
+            except (requests.RequestException, ValueError) as exception:
+                reason = exception
+            if attempt + 1 < retry.attempts:
+                wait = retry.wait(attempt, retry_after)
+                if wait is None:
+                    reason = f"{reason}, retry after {retry_after}"
+                    break
+                sleep(wait)
+        raise requests.HTTPError(
+            f"Failed to retrieve elements from '{url}', "
+            f"reason: {reason}"
+        )
+
+    def map(self, function: Callable, items: Iterable) -> List:
+        """Call a function on every item in a thread pool, keeping the order of
+        the items
+        """
+        items = list(items)
+        if self.concurrency == 1 or len(items) < 2:
+            return list(map(function, items))
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(items))) as pool:
+            return list(pool.map(function, items))
+
+    def iter_pages(
+        self,
+        url: str,
+        get: Callable[[str], Page] = None,
+    ) -> Iterator[List[Dict]]:
+        """Follow the `next` links from a URL, one page at a time.
+
+        The next page is requested as soon as its link is known, so it
+        downloads while the current page is being used.
+        """
+        get = get or self.get
+        visited = {url}
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(get, url) if url else None
+            while future is not None:
+                page, url = future.result()
+                future = None
+                if url:
+                    if url in visited:
+                        raise ValueError(f"The pages link back to '{url}'!")
+                    visited.add(url)
+                    future = pool.submit(get, url)
+                yield page
@@ -2,6 +2,7 @@ import traceback
 
 from functools import lru_cache
 from pathlib import Path
+from threading import RLock
 from uuid import uuid4
 from warnings import warn
 
@@ -50,6 +51,11 @@ class SysML2LabeledPropertyGraph(trt.HasTraits):
     nodes_by_type: dict = trt.Dict()
     edges_by_type: dict = trt.Dict()
 
+    def __init__(self, *args, **kwargs):
+        # the projections are cached, so make each only once, even for many threads
+        self._projection_lock = RLock()
+        super().__init__(*args, **kwargs)
+
     def __repr__(self):
         return (
             "<SysML v2 LPG: "
@@ -179,6 +185,15 @@ class SysML2LabeledPropertyGraph(trt.HasTraits):
             for target in relationship.target
         ] + edges_from_abstract_relationships)
 
+        # the library elements that relationships reach are nodes with their own data
+        if model.library is not None:
+            library = model.library.elements
+            graph.add_nodes_from([
+                (node, library[node]._data)
+                for node, data in graph.nodes(data=True)
+                if not data and node in library
+            ])
+
         with self.hold_trait_notifications():
             self.nodes = dict(graph.nodes)
             self.edges = dict(graph.edges)
@@ -387,12 +402,14 @@ class SysML2LabeledPropertyGraph(trt.HasTraits):
         implied_edge_types = implied_edge_types or []
 
         # NOTE: Sorting into a tuple to make the LRU Cache work
-        return self._adapt(
-            excluded_edge_types=tuple(sorted(excluded_edge_types)),
-            excluded_node_types=tuple(sorted(excluded_node_types)),
-            reversed_edge_types=tuple(sorted(reversed_edge_types)),
-            implied_edge_types=tuple(sorted(implied_edge_types)),
-        ).copy()
+        with self._projection_lock:
+            projection = self._adapt(
+                excluded_edge_types=tuple(sorted(excluded_edge_types)),
+                excluded_node_types=tuple(sorted(excluded_node_types)),
+                reversed_edge_types=tuple(sorted(reversed_edge_types)),
+                implied_edge_types=tuple(sorted(implied_edge_types)),
+            )
+        return projection.copy()
 
     @lru_cache
     def _adapt(self,
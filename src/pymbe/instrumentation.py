@@ -0,0 +1,91 @@
+# Timing and memory reports for the stages of loading a model
+import tracemalloc
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, List
+
+
+@dataclass
+class StageReport:
+    """The wall time, number of elements and peak memory of one load stage"""
+
+    name: str
+    seconds: float
+    elements: int = None
+    peak_bytes: int = None  # the most memory allocated during the stage
+
+
+@dataclass
+class LoadReport:
+    """The stages of loading a model, in the order they ran"""
+
+    stages: List[StageReport] = field(default_factory=list)
+
+    trace_memory: bool = True  # tracemalloc makes the stages much slower
+
+    def __str__(self) -> str:
+        lines = [f"{'stage':<16} {'seconds':>9} {'elements':>10} {'peak (MB)':>10}"]
+        for stage in self.stages:
+            elements = "" if stage.elements is None else f"{stage.elements:,d}"
+            peak = "" if stage.peak_bytes is None else f"{stage.peak_bytes / 1e6:,.1f}"
+            lines += [
+                f"{stage.name:<16} {stage.seconds:>9.3f} {elements:>10} {peak:>10}"
+            ]
+        lines += [f"{'total':<16} {self.seconds:>9.3f}"]
+        return "\n".join(lines)
+
+    @property
+    def seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages)
+
+    def __getitem__(self, name: str) -> StageReport:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(f"No '{name}' stage in the report!")
+
+    @contextmanager
+    def stage(self, name: str, count: Callable[[], int] = None):
+        """Record a stage, counting its elements with `count` once it is done.
+
+        A stage that fails is still recorded, without counting its elements.
+        """
+        start_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+        elif self.trace_memory and hasattr(tracemalloc, "reset_peak"):
+            # before Python 3.9, the peak may be from before the stage
+            tracemalloc.reset_peak()
+        traced_before, _ = tracemalloc.get_traced_memory()
+
+        start, failed = perf_counter(), True
+        try:
+            yield
+            failed = False
+        finally:
+            seconds = perf_counter() - start
+            peak_bytes = None
+            if self.trace_memory:
+                peak_bytes = tracemalloc.get_traced_memory()[1] - traced_before
+            if start_tracing:
+                tracemalloc.stop()
+            self.stages.append(StageReport(
+                name=name,
+                seconds=seconds,
+                elements=None if count is None or failed else count(),
+                peak_bytes=peak_bytes,
+            ))
+
+
+NO_STAGE = nullcontext()
+
+
+def no_stage(name: str, count: Callable[[], int] = None):
+    """Stand in for `LoadReport.stage` when the load is not instrumented"""
+    return NO_STAGE
+
+
+def get_stage(report: LoadReport = None) -> Callable:
+    return no_stage if report is None else report.stage
@@ -0,0 +1,179 @@
+# A persistent, size-bounded cache of the pages of elements downloaded from commits
+import hashlib
+import json
+import os
+import zlib
+
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any, Iterator, Optional, Tuple, Union
+
+
+CACHE_VERSION = 1
+DEFAULT_MAX_SIZE = 1 << 30
+COMPRESSION_LEVEL = 6
+
+# A key is (host, project, commit, page), an entry is (data, next page URL)
+Key = Tuple[str, str, str, str]
+Entry = Tuple[Any, Optional[str]]
+
+
+def default_cache_directory() -> Path:
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "pymbe" / "commits"
+
+
+class CommitCache:
+    """A cache on disk of the pages downloaded from commits, which never change.
+
+    The pages are stored compressed, once, named by the hash of their
+    content, and each key points at the content of its page.  When the
+    contents take more than `max_size` bytes, the ones that were used least
+    recently are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: Union[Path, str] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        if max_size < 0:
+            raise ValueError(f"Cannot cache up to {max_size} bytes!")
+        directory = Path(directory or default_cache_directory())
+        self.directory = directory / f"v{CACHE_VERSION}"
+        self.max_size = max_size
+        self._lock = Lock()
+        self._size = None
+
+    def __repr__(self) -> str:
+        return f"<CommitCache ({self.directory})>"
+
+    @property
+    def _contents(self) -> Path:
+        return self.directory / "contents"
+
+    @property
+    def _keys(self) -> Path:
+        return self.directory / "keys"
+
+    def _key_path(self, key: Key) -> Path:
+        digest = hashlib.sha256("\0".join(key).encode()).hexdigest()
+        return self._keys / digest[:2] / digest
+
+    def _content_path(self, digest: str) -> Path:
+        return self._contents / digest[:2] / digest
+
+    def get(self, key: Key) -> Optional[Entry]:
+        """Get a cached page and the URL of the next page, or None if it is not
+        cached
+        """
+        key_path = self._key_path(key)
+        try:
+            entry = json.loads(key_path.read_text(encoding="utf-8"))
+            content_path = self._content_path(entry["content"])
+            data = json.loads(zlib.decompress(content_path.read_bytes()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, zlib.error):
+            # a corrupted entry is downloaded again
+            _remove(key_path)
+            return None
+        _touch(content_path)
+        return data, entry["next"]
+
+    def put(self, key: Key, data: Any, next_url: Optional[str] = None):
+        """Cache a page, and the URL of the next page"""
+        content = json.dumps(data, separators=(",", ":")).encode()
+        digest = hashlib.sha256(content).hexdigest()
+        content_path = self._content_path(digest)
+        if not _touch(content_path):
+            compressed = zlib.compress(content, COMPRESSION_LEVEL)
+            self._write(content_path, compressed)
+            with self._lock:
+                if self._size is not None:
+                    self._size += len(compressed)
+        self._write(
+            self._key_path(key),
+            json.dumps(dict(key=key, content=digest, next=next_url)).encode(),
+        )
+        if self._size is None or self._size > self.max_size:
+            self.evict()
+
+    def evict(self, max_size: int = None):
+        """Remove the least recently used contents, until they fit in
+        `max_size` bytes
+        """
+        max_size = self.max_size if max_size is None else max_size
+        with self._lock:
+            contents = sorted(self._iter_contents(), key=lambda item: item[1].st_mtime)
+            self._size = sum(stat.st_size for _, stat in contents)
+            if self._size <= max_size:
+                return
+            evicted = set()
+            for path, stat in contents:
+                if self._size <= max_size:
+                    break
+                _remove(path)
+                evicted.add(path.name)
+                self._size -= stat.st_size
+            # and the keys of the evicted contents
+            for path in self._iter_files(self._keys):
+                try:
+                    entry = json.loads(path.read_text(encoding="utf-8"))
+                    if entry["content"] not in evicted:
+                        continue
+                except FileNotFoundError:
+                    continue
+                except (ValueError, KeyError):
+                    pass
+                _remove(path)
+
+    def clear(self):
+        self.evict(max_size=0)
+
+    @property
+    def size(self) -> int:
+        """The number of bytes taken by the compressed contents"""
+        return sum(stat.st_size for _, stat in self._iter_contents())
+
+    def _iter_contents(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        for path in self._iter_files(self._contents):
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _iter_files(directory: Path) -> Iterator[Path]:
+        if directory.is_dir():
+            for subdirectory in directory.iterdir():
+                yield from (
+                    path
+                    for path in subdirectory.iterdir()
+                    if not path.name.startswith(".")
+                )
+
+    @staticmethod
+    def _write(path: Path, content: bytes):
+        """Write a file all at once, so no reader finds it half written"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=path.parent, prefix=".", delete=False) as file:
+            file.write(content)
+        os.replace(file.name, path)
+
+
+def _remove(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _touch(path: Path) -> bool:
+    """Mark a file as just used, for the evictions, if it exists"""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
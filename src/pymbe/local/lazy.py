@@ -0,0 +1,329 @@
+# A lazily loaded Model, backed by a JSON-lines export and a sidecar offset index
+import json
+import mmap
+import weakref
+
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Union
+
+from ..model import (
+    Element,
+    IdEncoder,
+    ListGetter,
+    Model,
+    get_owner_id,
+    relationship_entries,
+)
+from .readers import iter_json_array, open_element_file
+
+
+INDEX_SUFFIX = ".index"
+INDEX_VERSION = 1
+
+
+def save_jsonl(elements: Iterable[dict], filepath: Union[Path, str]) -> Path:
+    """Write element data as JSON lines, one element per line"""
+    filepath = Path(filepath)
+    with open(filepath, "w", encoding="utf-8") as file:
+        for data in elements:
+            file.write(json.dumps(data))
+            file.write("\n")
+    return filepath
+
+
+def convert_to_jsonl(json_file: Union[Path, str], jsonl_file: Union[Path, str]) -> Path:
+    """Convert a (possibly compressed) JSON export into JSON lines"""
+    with open_element_file(json_file) as file:
+        return save_jsonl(iter_json_array(file), jsonl_file)
+
+
+def _source_stamp(filepath: Path) -> list:
+    stat = filepath.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def build_index(
+    filepath: Union[Path, str],
+    index_path: Union[Path, str] = None,
+) -> Path:
+    """Index a JSON-lines export by element id.
+
+    Each entry holds the byte offset of the element's line, its metatype, its
+    owner's id, and, for relationships, the ids of its sources and targets.
+    """
+    filepath = Path(filepath)
+    index_path = Path(index_path or f"{filepath}{INDEX_SUFFIX}")
+    index_path.write_text(json.dumps(_make_index(filepath)))
+    return index_path
+
+
+def _make_index(filepath: Path) -> dict:
+    entries = []
+    with open(filepath, "rb") as file:
+        offset = 0
+        for line in file:
+            if line.strip():
+                data = json.loads(line)
+                sources = targets = None
+                if "relatedElement" in data:
+                    sources = [ref["@id"] for ref in data["source"]]
+                    targets = [ref["@id"] for ref in data["target"]]
+                entries.append([
+                    data["@id"],
+                    offset,
+                    data["@type"],
+                    get_owner_id(data),
+                    sources,
+                    targets,
+                ])
+            offset += len(line)
+
+    return dict(
+        version=INDEX_VERSION,
+        source=_source_stamp(filepath),
+        entries=entries,
+    )
+
+
+class LazyElements(Mapping):
+    """A mapping of element ids to elements that reads and wraps each
+    element the first time it is accessed.
+
+    Metatype and ownership queries are answered from the index alone.  The
+    export stays open until `close` is called, or the mapping is collected.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        entries: List[list],
+        model: Model,
+        use_mmap: bool = False,
+    ):
+        self._model = model
+        self._elements: Dict[str, Element] = {}
+
+        ids, offsets, metatypes, owners, sources, targets = (
+            zip(*entries) if entries else ((),) * 6
+        )
+        self._offsets = dict(zip(ids, offsets))
+        self._metatypes = dict(zip(ids, metatypes))
+        self._owners = dict(zip(ids, owners))
+
+        by_metatype, by_owner = defaultdict(list), defaultdict(list)
+        for id_, metatype, owner_id in zip(ids, metatypes, owners):
+            by_metatype[metatype].append(id_)
+            by_owner[owner_id].append(id_)
+        self._by_metatype = dict(by_metatype)
+        self._by_owner = dict(by_owner)
+
+        self._relationship_ids = {}
+        derived = defaultdict(list)
+        for id_, metatype, sources_, targets_ in zip(ids, metatypes, sources, targets):
+            if sources_ is None:
+                continue
+            self._relationship_ids[id_] = None
+            for endpoint_id, key, other_id in relationship_entries(
+                metatype=metatype,
+                sources=sources_,
+                targets=targets_,
+            ):
+                derived[endpoint_id].append((key, other_id))
+        self._derived = dict(derived)
+
+        self._lock = Lock()
+        self._file = open(filepath, "rb")
+        self._mmap = None
+        if use_mmap:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._finalizer = weakref.finalize(self, _close_handles, self._file, self._mmap)
+
+    def __getitem__(self, id_: str) -> Element:
+        element = self._elements.get(id_)
+        if element is None:
+            # if another thread loaded it meanwhile, keep theirs
+            element = self._elements.setdefault(id_, self._load(id_))
+        return element
+
+    def __contains__(self, id_) -> bool:
+        return id_ in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _read_line(self, offset: int) -> bytes:
+        if self._mmap is not None:
+            end = self._mmap.find(b"\n", offset)
+            return self._mmap[offset:None if end < 0 else end]
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.readline()
+
+    def _load(self, id_: str) -> Element:
+        offset = self._offsets[id_]
+        element = Element(_data=json.loads(self._read_line(offset)), _model=self._model)
+        for key, other_id in self._derived.get(id_, ()):
+            element._derived[key] += [{"@id": other_id}]
+        return element
+
+    @property
+    def loaded(self) -> int:
+        """The number of elements that have been read so far"""
+        return len(self._elements)
+
+    def get_metatype(self, id_: str) -> str:
+        return self._metatypes[id_]
+
+    def get_owner_id(self, id_: str) -> str:
+        return self._owners[id_]
+
+    def ids_by_metatype(self, metatype: str) -> List[str]:
+        return list(self._by_metatype.get(metatype, ()))
+
+    def owned_ids(self, owner_id: str) -> List[str]:
+        return list(self._by_owner.get(owner_id, ()))
+
+    def is_relationship(self, id_: str) -> bool:
+        return id_ in self._relationship_ids
+
+    def subset(self, ids: Iterable[str]) -> "LazySubset":
+        return LazySubset(self, ids)
+
+    def close(self):
+        self._finalizer()
+
+    def __enter__(self) -> "LazyElements":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def _close_handles(file, mapped: mmap.mmap = None):
+    if mapped is not None:
+        mapped.close()
+    file.close()
+
+
+class LazyList(Sequence):
+    """A list of elements by id, where each element is read when it is used"""
+
+    def __init__(self, elements: LazyElements, ids: List[str]):
+        self._elements = elements
+        self._ids = ids
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyList(self._elements, self._ids[index])
+        return self._elements[self._ids[index]]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        return f"<LazyList of {len(self._ids)} elements>"
+
+
+class LazySubset(Mapping):
+    """A view over some of the ids of a `LazyElements` mapping"""
+
+    def __init__(self, elements: LazyElements, ids: Iterable[str]):
+        self._elements = elements
+        self._ids = dict.fromkeys(ids)
+
+    def __getitem__(self, id_: str) -> Element:
+        if id_ not in self._ids:
+            raise KeyError(id_)
+        return self._elements[id_]
+
+    def __contains__(self, id_) -> bool:
+        return id_ in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class LazyMetatypes(Mapping):
+    """Elements by metatype, answered from the index, where each element is
+    only read when it is used
+    """
+
+    def __init__(self, elements: LazyElements):
+        self._elements = elements
+        self._ids = elements._by_metatype
+
+    def __getitem__(self, metatype: str) -> LazyList:
+        return LazyList(self._elements, self._ids[metatype])
+
+    def __contains__(self, metatype) -> bool:
+        return metatype in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def load_lazy(
+    filepath: Union[Path, str],
+    index_path: Union[Path, str] = None,
+    use_mmap: bool = False,
+) -> Model:
+    """Make a model whose elements are read from a JSON-lines export on first access.
+
+    The sidecar index is (re)built if it is missing or out of date.  The
+    export is kept open until the model is closed, e.g., with `Model.close`.
+    """
+    filepath = Path(filepath)
+    if not filepath.is_file():
+        raise ValueError(f"'{filepath}' does not exist!")
+    index_path = Path(index_path or f"{filepath}{INDEX_SUFFIX}")
+
+    index = None
+    if index_path.is_file():
+        index = json.loads(index_path.read_text())
+        if (
+            index.get("version") != INDEX_VERSION
+            or index.get("source") != _source_stamp(filepath)
+        ):
+            index = None
+    if index is None:
+        index = _make_index(filepath)
+        index_path.write_text(json.dumps(index))
+
+    model = Model(elements={}, name=filepath.name, source=filepath.resolve())
+    elements = LazyElements(filepath, index["entries"], model, use_mmap=use_mmap)
+    model.id_encoder = IdEncoder(elements)
+
+    relationship_ids = elements._relationship_ids
+    model.elements = elements
+    model.all_relationships = elements.subset(elements._relationship_ids)
+    model.all_non_relationships = elements.subset(
+        id_ for id_ in elements if id_ not in relationship_ids
+    )
+    owners = elements._owners
+    roots = [
+        id_
+        for id_, owner_id in owners.items()
+        if owner_id is None or owner_id not in owners
+    ]
+    model.ownedElement = ListGetter(
+        elements[id_] for id_ in roots if id_ not in relationship_ids
+    )
+    model.ownedRelationship = [
+        elements[id_] for id_ in roots if id_ in relationship_ids
+    ]
+    model.ownedMetatype = LazyMetatypes(elements)
+    # references are not indexed, so the first `referrers` query reads every element
+    model._referrers = None
+    return model
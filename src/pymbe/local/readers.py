@@ -0,0 +1,94 @@
+# Helpers to read SysML v2 element exports from disk without loading them all at once
+import gzip
+import json
+import lzma
+
+from pathlib import Path
+from sys import intern
+from typing import Any, Iterator, TextIO, Union
+
+
+CHUNK_SIZE = 1 << 16
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+WHITESPACE = " \t\n\r"
+DELIMITERS = WHITESPACE + ",]"
+
+
+def open_element_file(filepath: Union[Path, str]) -> TextIO:
+    """Open a (possibly gzip or xz compressed) JSON export as text"""
+    with open(filepath, "rb") as raw:
+        magic = raw.read(len(XZ_MAGIC))
+
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(filepath, "rt", encoding="utf-8")
+    if magic.startswith(XZ_MAGIC):
+        return lzma.open(filepath, "rt", encoding="utf-8")
+    return open(filepath, "rt", encoding="utf-8")
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array, one at a time.
+
+    Only a window of the text around the current item is kept in memory,
+    so the size of the file does not dictate the peak memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    expected = "["
+
+    while True:
+        # skip any whitespace, reading more of the file as needed
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+
+        if position >= len(buffer):
+            raise json.JSONDecodeError("Unterminated array", buffer, position)
+
+        char = buffer[position]
+        if expected == "[":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, position)
+            position += 1
+            expected = "value or ]"
+            continue
+
+        if char == "]" and expected in ("value or ]", ", or ]"):
+            return
+
+        if expected == ", or ]":
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+            position += 1
+            expected = "value"
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # a value not followed by a delimiter may have been cut short (e.g., a number)
+        if end is None or (
+            not eof and (end == len(buffer) or buffer[end] not in DELIMITERS)
+        ):
+            chunk = stream.read(max(chunk_size, len(buffer) - position))
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        # the decoder only shares the keys within an item, so share them across items
+        if isinstance(item, dict):
+            item = {intern(key): value for key, value in item.items()}
+        yield item
+        position = end
+        expected = ", or ]"
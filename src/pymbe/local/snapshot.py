@@ -0,0 +1,131 @@
+# A binary snapshot of a loaded Model, including all its derived data
+import os
+import pickle
+
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Tuple, Union
+
+
+SNAPSHOT_MAGIC = b"PYMBE-SNAPSHOT"
+SNAPSHOT_VERSION = 6
+
+
+def library_reference(library) -> Tuple[str, str, int]:
+    """What a snapshot keeps of a library model, to check it is loaded with
+    the same one
+    """
+    return "library", library.name, len(library.elements)
+
+
+class SnapshotPickler(pickle.Pickler):
+    """Pickle a model, with only a reference to its library model"""
+
+    def __init__(self, file, model):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        from ..model import Element
+
+        self._element_type = Element
+        self._library = model.library
+        self._library_elements = {id(model.library.elements)}
+        # the model may have been made before the library was frozen
+        self._library_elements.add(id(getattr(model.elements, "library", None)))
+
+    def persistent_id(self, obj):
+        library = self._library
+        if obj is library:
+            return library_reference(library)
+        if id(obj) in self._library_elements:
+            return ("library elements",)
+        if isinstance(obj, self._element_type) and library.elements.get(obj._id) is obj:
+            return ("library element", obj._id)
+        return None
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """Unpickle a model, with the library model it was saved with"""
+
+    def __init__(self, file, filepath: Path, library=None):
+        super().__init__(file)
+        self._filepath = filepath
+        self._library = library
+
+    def persistent_load(self, pid):
+        library = self._library
+        if library is None:
+            raise ValueError(
+                f"'{self._filepath}' was saved with a library model, "
+                "load it with that library!"
+            )
+        if pid[0] == "library":
+            if pid != library_reference(library):
+                raise ValueError(
+                    f"'{self._filepath}' was saved with the library '{pid[1]}' "
+                    f"of {pid[2]} elements, not with '{library.name}'!"
+                )
+            return library
+        if pid[0] == "library elements":
+            return library.elements
+        if pid[0] == "library element":
+            return library.elements[pid[1]]
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}!")
+
+
+def save_snapshot(model, filepath: Union[Path, str]) -> Path:
+    """Save a model with its elements, owned elements, relationship maps,
+    metatypes, reference index and derived relationship entries, so it can be reloaded
+    without recomputing any of them.
+
+    The library model, if there is one, is not saved with the model, the
+    snapshot is loaded with the same library (see `load_snapshot`).  The
+    snapshot replaces the file only once it is complete.
+    """
+    filepath = Path(filepath)
+    with NamedTemporaryFile(dir=filepath.parent, prefix=".", delete=False) as file:
+        try:
+            file.write(SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]))
+            if model.library is None:
+                pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                SnapshotPickler(file, model).dump(model)
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
+    os.replace(file.name, filepath)
+    return filepath
+
+
+def load_snapshot(filepath: Union[Path, str], library=None):
+    """Load a model saved with `save_snapshot`, with the `library` model it
+    was saved with, if it had one, which the loaded models share.
+
+    ..warning::
+        Snapshots are pickles: only load snapshots you trust.
+    """
+    from ..model import collector_paused
+
+    filepath = Path(filepath)
+    if not filepath.is_file():
+        raise ValueError(f"'{filepath}' does not exist!")
+
+    with open(filepath, "rb") as file:
+        header = file.read(len(SNAPSHOT_MAGIC) + 1)
+        if not header.startswith(SNAPSHOT_MAGIC):
+            raise ValueError(f"'{filepath}' is not a pymbe model snapshot!")
+        version = header[-1]
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"'{filepath}' is a version {version} snapshot, "
+                f"but only version {SNAPSHOT_VERSION} can be loaded!"
+            )
+
+        # nothing becomes garbage while unpickling, so don't let the
+        # collector repeatedly scan the growing model
+        with collector_paused():
+            model = SnapshotUnpickler(file, filepath, library=library).load()
+
+    # the elements were pickled with strong references to the model
+    if model._gc_frozen:
+        model.freeze_gc()
+    return model
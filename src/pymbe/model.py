@@ -1,28 +1,298 @@
+import gc
 import json
 
 from collections import defaultdict
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import InitVar, dataclass, field
 from enum import Enum
+from multiprocessing import get_start_method
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple, Union
+from sys import intern
+from threading import Lock
+from typing import Any, Container, Dict, Iterable, Iterator, List, Set, Tuple, Union
 from warnings import warn
+from weakref import ReferenceType, ref
+
+from .instrumentation import LoadReport, get_stage
+from .local.readers import iter_json_array, open_element_file
+from .local.snapshot import load_snapshot, save_snapshot
 
 
 class ListGetter(list):
-    """A list that also can return items by their name."""
+    """A list that also can return items by their name.
+
+    The names are indexed the first time an item is looked up by name, and
+    the index is kept in sync as the list changes.
+    """
+
+    __slots__ = ("_names",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._names = None
+
+    def __reduce__(self):
+        # the name index is rebuilt when needed
+        return self.__class__, (list(self),)
 
     # FIXME: figure out why __dir__ of returned objects think they are lists
     def __getitem__(self, key):
-        item_map = {
-            item._data["name"]: item
-            for item in self
-            if isinstance(item, Element)
-            and "name" in item._data
-        }
-        if key in item_map:
-            return item_map[key]
+        if isinstance(key, (int, slice)):
+            return super().__getitem__(key)
+        names = self._names
+        if names is None:
+            # the index is only shared once it is complete, for other threads
+            names = {}
+            self._add_names(self, names)
+            self._names = names
+        if key in names:
+            return names[key]
         return super().__getitem__(key)
 
+    @staticmethod
+    def _add_names(items, names: dict):
+        # when names are repeated, the last item with that name wins
+        for item in items:
+            if isinstance(item, Element) and "name" in item._data:
+                names[item._data["name"]] = item
+
+    def _reset_names(self):
+        self._names = None
+
+    def append(self, item):
+        super().append(item)
+        if self._names is not None:
+            self._add_names((item,), self._names)
+
+    def extend(self, items):
+        start = len(self)
+        super().extend(items)
+        if self._names is not None:
+            self._add_names(self[start:], self._names)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._reset_names()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._reset_names()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._reset_names()
+
+    def remove(self, item):
+        super().remove(item)
+        self._reset_names()
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self._reset_names()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._reset_names()
+
+    def reverse(self):
+        super().reverse()
+        self._reset_names()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reset_names()
+
+    def __imul__(self, value):
+        result = super().__imul__(value)
+        self._reset_names()
+        return result
+
+
+class TupleGetter(tuple):
+    """A tuple that also can return items by their name"""
+
+    def __reduce__(self):
+        return self.__class__, (tuple(self),)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return super().__getitem__(key)
+        names = self.__dict__.get("_names")
+        if names is None:
+            names = {}
+            ListGetter._add_names(self, names)
+            self._names = names
+        if key in names:
+            return names[key]
+        return super().__getitem__(key)
+
+
+class FrozenDict(dict):
+    """A read-only dictionary"""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"Cannot change a {self.__class__.__name__}!")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+# The derived data of the frozen elements without any
+NO_DERIVED = FrozenDict()
+
+
+class LibraryElements(dict):
+    """The elements of a model, falling back to the elements of a shared
+    library model for the ids the model doesn't have.
+
+    Iterating, `len`, etc. only cover the model's own elements.
+    """
+
+    __slots__ = ("library",)
+
+    def __init__(self, elements=(), library: Dict[str, "Element"] = None):
+        super().__init__(elements)
+        self.library = {} if library is None else library
+
+    def __reduce__(self):
+        return self.__class__, (dict(self), self.library)
+
+    def __missing__(self, id_: str) -> "Element":
+        return self.library[id_]
+
+    def __contains__(self, id_) -> bool:
+        return dict.__contains__(self, id_) or id_ in self.library
+
+    def get(self, id_: str, default: Any = None) -> Any:
+        element = dict.get(self, id_)
+        if element is None:
+            return self.library.get(id_, default)
+        return element
+
+
+class FrozenLibraryElements(FrozenDict, LibraryElements):
+    """Read-only `LibraryElements`"""
+
+    __slots__ = ()
+
+    __reduce__ = LibraryElements.__reduce__
+
+
+def freeze_data(value: Any, references: Dict[str, FrozenDict]) -> Any:
+    """Make a read-only copy of some element data, with dicts as `FrozenDict`s
+    and lists as tuples.
+
+    References (i.e., `{"@id": ...}`) to the same element share one
+    `FrozenDict`, kept in `references`.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        if len(value) == 1 and "@id" in value:
+            id_ = value["@id"]
+            reference = references.get(id_)
+            if reference is None:
+                reference = references[id_] = FrozenDict(value)
+            return reference
+        frozen = {}
+        for key, item in value.items():
+            item_type = type(item)
+            if item_type is list and not item:
+                item = ()
+            elif item_type is dict or item_type is list or item_type is ListGetter:
+                item = freeze_data(item, references)
+            frozen[key] = item
+        return FrozenDict(frozen)
+    if value_type is list:
+        return tuple([freeze_data(item, references) for item in value])
+    if value_type is ListGetter:
+        return TupleGetter(freeze_data(item, references) for item in value)
+    return value
+
+
+def thaw_data(value: Any) -> Any:
+    """Make a changeable copy of some (possibly frozen) element data"""
+    if isinstance(value, dict):
+        return {
+            key: thaw_data(item) if isinstance(item, (dict, list, tuple)) else item
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [thaw_data(item) for item in value]
+    return value
+
+
+class IdEncoder:
+    """A model-wide encoding of element ids as dense integers.
+
+    Codes are given in the order the ids are first seen, and are never
+    reused, so they stay valid as elements are added and removed.
+    """
+
+    __slots__ = ("_codes", "_ids", "_lock")
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids = list(dict.fromkeys(ids))
+        self._codes = {id_: code for code, id_ in enumerate(self._ids)}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id_) -> bool:
+        return id_ in self._codes
+
+    def __getstate__(self):
+        return self._ids
+
+    def __setstate__(self, ids: List[str]):
+        self._ids = ids
+        self._codes = {id_: code for code, id_ in enumerate(ids)}
+        self._lock = Lock()
+
+    def encode(self, id_: str) -> int:
+        """Get the code of an id, giving it the next code if it has none"""
+        code = self._codes.get(id_)
+        if code is None:
+            with self._lock:
+                # another thread may have given it a code meanwhile
+                code = self._codes.get(id_)
+                if code is None:
+                    code = len(self._ids)
+                    self._ids.append(id_)
+                    self._codes[id_] = code
+        return code
+
+    def decode(self, code: int) -> str:
+        return self._ids[code]
+
+    def encode_all(self, ids: Iterable[str]) -> List[int]:
+        codes = self._codes
+        return [
+            codes[id_] if id_ in codes else self.encode(id_)
+            for id_ in ids
+        ]
+
+    def decode_all(self, codes: Iterable[int]) -> List[str]:
+        ids = self._ids
+        return [ids[code] for code in codes]
+
+    def copy(self) -> "IdEncoder":
+        encoder = IdEncoder()
+        encoder._ids = list(self._ids)
+        encoder._codes = dict(self._codes)
+        return encoder
+
 
 class Naming(Enum):
     """An enumeration for how to repr SysML elements"""
@@ -55,12 +325,30 @@ class Naming(Enum):
             return f"""<{name} «{data["@type"]}»>"""
 
 
+@dataclass
+class ModelDelta:
+    """The ids and metatypes affected by applying a delta to a model"""
+
+    added: Set[str] = field(default_factory=set)
+    changed: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+
+    # elements whose derived relationship entries or references changed
+    related: Set[str] = field(default_factory=set)
+    metatypes: Set[str] = field(default_factory=set)
+
+    @property
+    def invalidated(self) -> Set[str]:
+        """The ids of every element whose data or derived data changed"""
+        return self.added | self.changed | self.removed | self.related
+
+
 @dataclass(repr=False)
 class Model:
     """A SysML v2 Model"""
 
-    # TODO: Look into making elements immutable (e.g., frozen dict)
-    elements: Dict[str, "Element"]
+    # the element data is read-only once the model is frozen (see `freeze`)
+    elements: Union[Dict[str, "Element"], Iterable[Dict]]
 
     name: str = "SysML v2 Model"
 
@@ -73,19 +361,104 @@ class Model:
 
     source: Any = None
 
+    # A shared model of library elements, used for the ids this model doesn't have.
+    # NOTE: The library elements are shared, so they don't get the derived entries
+    #       (e.g., reverseImport) of the relationships to them in this model
+    library: "Model" = None
+
+    # Dense integer codes for the element ids, for int-keyed arrays and graphs
+    id_encoder: IdEncoder = field(default_factory=IdEncoder)
+
     _naming: Naming = Naming.long  # The scheme to use for repr'ing the elements
 
-    def __post_init__(self):
-        self.elements = {
-            id_: Element(_data=data, _model=self)
-            for id_, data in self.elements.items()
-            if isinstance(data, dict)
-        }
+    # The ids of the elements referencing an element, by attribute and referenced id
+    _referrers: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+
+    # The hashes of the element data, and of the data of each element's
+    # ownership subtree
+    _content_hashes: Dict[str, bytes] = field(default_factory=dict)
+    _subtree_hashes: Dict[str, bytes] = field(default_factory=dict)
+
+    _frozen: bool = False  # Whether the model can only be changed with `edit`
+
+    # Changed whenever the model changes, to drop the values the elements resolved
+    _generation: int = 0
+
+    # Whether the model is in the collector's permanent generation (see `freeze_gc`)
+    _gc_frozen: bool = False
+
+    # The timing and memory of the stages of loading the model, if instrumented
+    load_report: LoadReport = None
+
+    # The number of processes to scan the elements with while loading
+    processes: InitVar[int] = None
+
+    # Whether to move the model to the collector's permanent generation once loaded
+    gc_frozen: InitVar[bool] = False
 
-        self._add_owned()
+    def __post_init__(self, processes: int = None, gc_frozen: bool = False):
+        # the whole model is kept, so there is no point in the collector
+        # scanning it while loading
+        with collector_paused(gc_frozen):
+            self._add_elements(processes)
+        if gc_frozen:
+            stage = get_stage(self.load_report)
+            with stage("freeze gc", count=lambda: len(self.elements)):
+                self.freeze_gc()
+
+    def _add_elements(self, processes: int = None):
+        stage = get_stage(self.load_report)
+        elements = self.elements
+        if isinstance(elements, dict):
+            elements, wrap_stage = elements.items(), "wrap"
+        else:
+            # an iterable of element data, e.g., streamed from a file
+            elements = (
+                (data["@id"], data)
+                for data in elements
+                if isinstance(data, dict)
+            )
+            wrap_stage = "decode and wrap"
+
+        def count() -> int:
+            return len(self.elements)
+
+        with stage(wrap_stage, count=count):
+            if self.library is None:
+                self.elements = {
+                    id_: Element(_data=data, _model=self)
+                    for id_, data in elements
+                    if isinstance(data, dict)
+                }
+            else:
+                # the copies of the library elements are left to the library
+                library = self.library.elements
+                self.elements = LibraryElements(
+                    (
+                        (id_, Element(_data=data, _model=self))
+                        for id_, data in elements
+                        if isinstance(data, dict) and id_ not in library
+                    ),
+                    library=library,
+                )
+
+        with stage("encode ids", count=count):
+            self.id_encoder = IdEncoder(self.elements)
+        with stage("scan", count=count):
+            scans = scan_model_elements(
+                [element._data for element in self.elements.values()],
+                processes=processes,
+            )
+        with stage("owned", count=count):
+            self._add_owned(scans)
+        with stage("referrers", count=count):
+            self._add_referrers()
 
         # Modify and add derived data to the elements
-        self._add_relationships()
+        with stage("relationships", count=lambda: len(self.all_relationships)):
+            self._add_relationships(scans)
+        with stage("classes", count=count):
+            self._add_element_properties(self.elements.values())
         # TODO: Bring this back when things get resolved
         # self._add_labels()
 
@@ -96,32 +469,123 @@ class Model:
     @staticmethod
     def load(
         elements: Union[List[Dict], Set[Dict], Tuple[Dict]],
+        instrument: bool = False,
         **kwargs,
     ) -> "Model":
-        """Make a Model from an iterable container of elements"""
-        return Model(
-            elements={
+        """Make a Model from an iterable container of elements
+
+        If `instrument` is True, a report of the time and memory taken by
+        each stage of the load is kept in the model's `load_report`.
+        """
+        if instrument and kwargs.get("load_report") is None:
+            kwargs["load_report"] = LoadReport()
+        stage = get_stage(kwargs.get("load_report"))
+        with stage("key by id", count=lambda: len(elements)):
+            elements = {
                 element["@id"]: element
                 for element in elements
-            },
-            **kwargs,
-        )
+            }
+        return Model(elements=elements, **kwargs)
 
     @staticmethod
-    def load_from_file(filepath: Union[Path, str]) -> "Model":
-        """Make a model from a JSON file"""
+    def load_from_file(
+        filepath: Union[Path, str],
+        stream: bool = False,
+        processes: int = None,
+        instrument: bool = False,
+        gc_frozen: bool = False,
+        library: "Model" = None,
+    ) -> "Model":
+        """Make a model from a JSON file (optionally gzip or xz compressed)
+
+        If `stream` is True, the elements are read from the file and wrapped
+        one at a time, instead of decoding the whole file first.  If
+        `processes` is more than one, the element data is scanned in parallel.
+        If `instrument` is True, the model gets a `load_report`.  If
+        `gc_frozen` is True, the model is kept out of full collections (see
+        `Model.freeze_gc`).  The elements that are in the `library` model are
+        taken from it, instead of from the file.
+        """
         if isinstance(filepath, str):
             filepath = Path(filepath)
 
         if not filepath.is_file():
             raise ValueError(f"'{filepath}' does not exist!")
 
+        load_report = LoadReport() if instrument else None
+        with open_element_file(filepath) as file:
+            if stream:
+                return Model(
+                    elements=iter_json_array(file),
+                    name=filepath.name,
+                    source=filepath.resolve(),
+                    processes=processes,
+                    load_report=load_report,
+                    gc_frozen=gc_frozen,
+                    library=library,
+                )
+            with get_stage(load_report)("decode", count=lambda: len(elements)):
+                elements = json.load(file)
+
         return Model.load(
-            elements=json.loads(filepath.read_text()),
+            elements=elements,
             name=filepath.name,
             source=filepath.resolve(),
+            processes=processes,
+            load_report=load_report,
+            gc_frozen=gc_frozen,
+            library=library,
         )
 
+    @staticmethod
+    def load_lazy(
+        filepath: Union[Path, str],
+        index_path: Union[Path, str] = None,
+        use_mmap: bool = False,
+    ) -> "Model":
+        """Make a model from a JSON-lines export, reading elements on first access"""
+        from .local.lazy import load_lazy
+
+        return load_lazy(filepath, index_path=index_path, use_mmap=use_mmap)
+
+    def close(self):
+        """Release the file a lazily loaded model reads its elements from"""
+        close = getattr(self.elements, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "Model":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @staticmethod
+    def load_snapshot(filepath: Union[Path, str], library: "Model" = None) -> "Model":
+        """Make a model from a snapshot saved with `save_snapshot`, and the
+        `library` model it was saved with, if it had one
+        """
+        model = load_snapshot(filepath, library=library)
+        if not isinstance(model, Model):
+            raise ValueError(f"'{filepath}' does not contain a Model!")
+        return model
+
+    def save_snapshot(self, filepath: Union[Path, str]) -> Path:
+        """Save a binary snapshot of the model and all its derived data"""
+        if not isinstance(self.elements, dict):
+            raise ValueError("Cannot save a snapshot of a lazily loaded model!")
+        return save_snapshot(self, filepath)
+
+    def to_columns(self, as_frame: bool = False):
+        """Make columns of element attributes (see `pymbe.columns.model_columns`),
+        as a dict of NumPy arrays, or as a pandas DataFrame if `as_frame`
+        """
+        from .columns import model_columns, model_frame
+
+        if as_frame:
+            return model_frame(self)
+        return model_columns(self)
+
     def save_to_file(self, filepath: Union[Path, str], indent: int = 2) -> bool:
         if isinstance(filepath, str):
             filepath = Path(filepath)
@@ -132,6 +596,14 @@ class Model:
             ),
         )
 
+    def invalidate(self):
+        """Drop the values resolved from the references of every element, and
+        the hashes of their data, e.g., after changing element data in place
+        """
+        self._generation += 1
+        self._content_hashes = {}
+        self._subtree_hashes = {}
+
     def _add_labels(self):
         from .label import get_label
         for element in self.elements.values():
@@ -139,89 +611,855 @@ class Model:
             if label:
                 element._derived["label"] = label
 
-    def _add_owned(self):
+    def _add_owned(self, scans: List["ElementScan"]):
         """Adds owned elements, relationships, and metatypes to the model"""
         elements = self.elements
+        self.all_relationships, self.all_non_relationships = {}, {}
+        self.ownedElement, self.ownedRelationship = ListGetter(), []
+
+        by_metatype = defaultdict(list)
+        for id_, metatype, owner_id, entries in scans:
+            element = elements[id_]
+            # elements whose owners are not in the model (e.g., in a slice) are roots
+            is_root = owner_id is None or owner_id not in elements
+            if entries is None:
+                self.all_non_relationships[id_] = element
+                if is_root:
+                    self.ownedElement.append(element)
+            else:
+                self.all_relationships[id_] = element
+                if is_root:
+                    self.ownedRelationship.append(element)
+            by_metatype[intern(metatype)].append(element)
+        self.ownedMetatype = dict(by_metatype)
+
+    def _add_element_properties(self, elements: Iterable["Element"]):
+        """Add properties for the keys of the elements to their metatype's class"""
+        keys = defaultdict(set)
+        for element in elements:
+            keys[element.__class__].update(element._keys)
+        for element_class, class_keys in keys.items():
+            if element_class is not Element:
+                add_element_properties(element_class, class_keys)
+
+    def _add_referrers(self):
+        """Index every reference (i.e., `{"@id": ...}`) by the referenced id"""
+        referrers = defaultdict(lambda: defaultdict(list))
+        # the loop of `iter_references`, inlined as it takes twice as long
+        # through it, with the same checks, as the data may be wrapped (e.g.,
+        # in a ListGetter) or frozen
+        for id_, element in self.elements.items():
+            for key, value in element._data.items():
+                if isinstance(value, (list, tuple)):
+                    for item in value:
+                        if isinstance(item, dict) and "@id" in item:
+                            referrers[key][item["@id"]].append(id_)
+                elif isinstance(value, dict) and "@id" in value:
+                    referrers[key][value["@id"]].append(id_)
+        self._referrers = {key: dict(by_id) for key, by_id in referrers.items()}
+
+    def slice(
+        self,
+        roots: Iterable[Union["Element", str]],
+        name: str = None,
+    ) -> "Model":
+        """Make a new model of some elements (e.g., packages), everything they
+        own, and everything those reference, recursively.
+
+        References to the owners of an element (see `is_owner_key`) are not
+        followed, so the slice doesn't grow to the rest of the model, and
+        neither are references to the library, which the slice shares.  The
+        elements whose owners are left out, like the roots, are owned
+        elements of the slice, without an owner.  The element data is
+        copied, so the slice can be changed on its own.
+        """
+        elements, library = self.elements, self._library_ids()
+        stack = []
+        for root in roots:
+            id_ = root._id if isinstance(root, Element) else root
+            if id_ not in elements:
+                raise ValueError(f"Cannot slice from '{id_}', it is not in the model!")
+            stack.append(id_)
+
+        sliced = set(stack)
+        while stack:
+            for key, referenced_id in iter_references(elements[stack.pop()]._data):
+                if (
+                    referenced_id not in sliced
+                    and referenced_id in elements
+                    and referenced_id not in library
+                    and not is_owner_key(key)
+                ):
+                    sliced.add(referenced_id)
+                    stack.append(referenced_id)
+
+        # the slice is kept, so don't let the collector scan this model while making it
+        with collector_paused():
+            return Model(
+                elements={
+                    id_: thaw_data(elements[id_]._data)
+                    # in the same order as in this model
+                    for id_ in sorted(sliced, key=self.id_encoder.encode)
+                },
+                name=name or f"{self.name} (slice)",
+                source=self.source,
+                library=self.library,
+                _naming=self._naming,
+            )
+
+    def referrers(
+        self,
+        element: Union["Element", str],
+        via: str = None,
+    ) -> List["Element"]:
+        """Get the elements that reference an element, optionally only
+        through the attribute named `via` (e.g., "type" or "owner")
+        """
+        id_ = element._id if isinstance(element, Element) else element
+        if self._referrers is None:
+            self._add_referrers()
+        if via is None:
+            by_ids = self._referrers.values()
+        else:
+            by_ids = [self._referrers.get(via, {})]
+
+        elements = self.elements
+        referrer_ids = dict.fromkeys(
+            referrer_id
+            for by_id in by_ids
+            for referrer_id in by_id.get(id_, ())
+        )
+        return [elements[referrer_id] for referrer_id in referrer_ids]
+
+    def _add_hashes(self):
+        """Hash the data of the elements not hashed yet, and then the subtrees
+        of all elements, bottom-up along the ownership tree
+        """
+        from .diff import hash_data, hash_subtree
+
+        elements = self.elements
+        content_hashes = self._content_hashes
+        owned = defaultdict(list)
+        for id_, element in elements.items():
+            if id_ not in content_hashes:
+                content_hashes[id_] = hash_data(element._data)
+            owned[get_owner_id(element._data)].append(id_)
+
+        # owners come before the elements they own...
+        ordered = [
+            id_
+            for owner_id, owned_ids in owned.items()
+            if owner_id not in elements
+            for id_ in owned_ids
+        ]
+        index = 0
+        while index < len(ordered):
+            ordered += owned.get(ordered[index], ())
+            index += 1
+
+        # ... so walk them backwards to hash the owned elements first
+        subtree_hashes = {}
+        for id_ in reversed(ordered):
+            owned_ids = owned.get(id_)
+            if owned_ids:
+                subtree_hashes[id_] = hash_subtree(
+                    content_hashes[id_],
+                    [subtree_hashes[owned_id] for owned_id in owned_ids],
+                )
+            else:
+                subtree_hashes[id_] = content_hashes[id_]
+
+        # elements in ownership cycles are not reached from a root
+        for id_ in elements:
+            if id_ not in subtree_hashes:
+                subtree_hashes[id_] = content_hashes[id_]
+        self._subtree_hashes = subtree_hashes
+
+    def freeze(self) -> "Model":
+        """Make the model and the data of its elements read-only.
 
-        self.all_relationships = {
-            id_: element
-            for id_, element in elements.items()
-            if element._is_relationship
+        Element data becomes `FrozenDict`s and tuples, and all references
+        to an element share the same data.  Frozen models can only be
+        changed with `edit`, which makes a new model.
+        """
+        if not isinstance(self.elements, dict):
+            raise ValueError("Cannot freeze a lazily loaded model!")
+
+        # the data is copied, so don't let the collector repeatedly scan the copies
+        with collector_paused():
+            self._freeze()
+        return self
+
+    def _freeze(self):
+        references = {}
+        for element in self.elements.values():
+            element._freeze(references)
+
+        if isinstance(self.elements, LibraryElements):
+            self.elements = FrozenLibraryElements(self.elements, self.elements.library)
+        else:
+            self.elements = FrozenDict(self.elements)
+        self.all_relationships = FrozenDict(self.all_relationships)
+        self.all_non_relationships = FrozenDict(self.all_non_relationships)
+        self.ownedElement = TupleGetter(self.ownedElement)
+        self.ownedRelationship = tuple(self.ownedRelationship)
+        self.ownedMetatype = FrozenDict({
+            metatype: tuple(elements)
+            for metatype, elements in self.ownedMetatype.items()
+        })
+        if self._referrers is not None:
+            self._referrers = FrozenDict({
+                key: FrozenDict({
+                    referenced_id: tuple(referrer_ids)
+                    for referenced_id, referrer_ids in by_id.items()
+                })
+                for key, by_id in self._referrers.items()
+            })
+        self._frozen = True
+        # the data is the same, so only the resolved values are dropped
+        self._generation += 1
+
+    def seal(self) -> "Model":
+        """Make the model read-only and safe to query from many threads.
+
+        The model is frozen (see `freeze`) and the hashes, which are
+        otherwise computed when first needed, are computed now.  These can
+        then be called from many threads at once:
+
+        * getting element attributes and items, `get_owner`, `referrers`,
+          `to_columns`, `edit` (which makes a new model) and `diff_models`;
+        * the labels in `pymbe.label`;
+        * the projections of a `SysML2LabeledPropertyGraph` of the model,
+          and the queries in `pymbe.query` on them.
+
+        Threads racing to resolve the same element attribute may each
+        resolve it, but always to equal values.  Making instances of the
+        elements is guarded, but changing the model, e.g., with
+        `invalidate` or by changing its `SysML2LabeledPropertyGraph`, is not.
+        """
+        if not self._frozen:
+            self.freeze()
+        if not self._subtree_hashes:
+            self._add_hashes()
+        return self
+
+    def freeze_gc(self) -> "Model":
+        """Keep full garbage collections from scanning the model.
+
+        The elements are made to reference the model weakly, so it is freed
+        as soon as it is no longer used, and then everything in memory is
+        moved to the collector's permanent generation with `gc.freeze`.
+        Keep a reference to the model for as long as its elements are used.
+
+        The collector never frees objects in the permanent generation, so
+        the garbage is collected first, and cycles between the elements
+        (e.g., through the values they resolved, or their instances) are only
+        freed after `gc.unfreeze()`.
+        """
+        if not isinstance(self.elements, dict):
+            raise ValueError("Cannot freeze a lazily loaded model in the collector!")
+
+        model = ref(self)
+        for element in self.elements.values():
+            element._model = model
+        self._gc_frozen = True
+        gc.collect()
+        gc.freeze()
+        return self
+
+    def edit(
+        self,
+        added: Iterable[Dict] = (),
+        changed: Iterable[Dict] = (),
+        removed: Iterable[Union[str, Dict]] = (),
+    ) -> "Model":
+        """Make a new frozen model with a delta applied (see `apply_delta`).
+
+        The new model shares the (read-only) data of the unchanged elements
+        with this one, which is left as it was.
+        """
+        if not self._frozen:
+            raise ValueError("Only frozen models are edited, use apply_delta instead!")
+
+        model = Model(
+            elements={},
+            name=self.name,
+            source=self.source,
+            library=self.library,
+            _naming=self._naming,
+        )
+        elements = {
+            id_: element._copy(model)
+            for id_, element in self.elements.items()
+        }
+        model.elements = elements
+        if self.library is not None:
+            model.elements = LibraryElements(elements, self.library.elements)
+        model.all_relationships = {
+            id_: elements[id_] for id_ in self.all_relationships
+        }
+        model.all_non_relationships = {
+            id_: elements[id_] for id_ in self.all_non_relationships
         }
-        self.all_non_relationships = {
-            id_: element
-            for id_, element in elements.items()
-            if not element._is_relationship
+        model.ownedElement = ListGetter(
+            elements[element._id] for element in self.ownedElement
+        )
+        model.ownedRelationship = [
+            elements[element._id] for element in self.ownedRelationship
+        ]
+        model.ownedMetatype = {
+            metatype: [elements[element._id] for element in owned]
+            for metatype, owned in self.ownedMetatype.items()
         }
+        if self._referrers is None:
+            model._referrers = None
+        else:
+            # the lists of referrer ids are replaced, not changed, when indexing
+            model._referrers = {
+                key: dict(by_id) for key, by_id in self._referrers.items()
+            }
+        model._content_hashes = dict(self._content_hashes)
+        model.id_encoder = self.id_encoder.copy()
+
+        model.apply_delta(added=added, changed=changed, removed=removed)
+        return model.freeze()
+
+    def apply_delta(
+        self,
+        added: Iterable[Dict] = (),
+        changed: Iterable[Dict] = (),
+        removed: Iterable[Union[str, Dict]] = (),
+    ) -> ModelDelta:
+        """Update the model in place with the element data added, changed and
+        removed (by id or data) in a new commit.
 
-        owned = [
-            element
-            for element in elements.values()
-            if element.get_owner() is None
+        Only the owned elements, metatypes, references and derived
+        relationship entries involving those elements are updated.  Changed
+        elements keep their `Element`, so existing references to them stay valid.
+        """
+        if not isinstance(self.elements, dict):
+            raise ValueError("Cannot apply a delta to a lazily loaded model!")
+        if self._frozen:
+            raise ValueError("Cannot change a frozen model, use edit instead!")
+
+        # check the whole delta first, so a bad delta leaves the model as it was
+        elements = self.elements
+        added, changed = list(added), list(changed)
+        for data in (*added, *changed):
+            check_element_data(data)
+        added = {data["@id"]: data for data in added}
+        changed = {data["@id"]: data for data in changed}
+        removed = [
+            item["@id"] if isinstance(item, dict) else item
+            for item in removed
         ]
-        self.ownedElement = ListGetter(
-            element
-            for element in owned
-            if not element._is_relationship
+        repeated = (
+            (added.keys() & changed.keys())
+            | (added.keys() & set(removed))
+            | (changed.keys() & set(removed))
         )
+        if repeated:
+            raise ValueError(
+                f"Elements {sorted(repeated)} are in more than one part of the delta!"
+            )
+        for id_ in added:
+            if id_ in elements:
+                raise ValueError(f"Cannot add '{id_}', it is already in the model!")
+        library = self._library_ids()
+        for id_ in (*changed, *removed):
+            if id_ in library:
+                raise ValueError(f"Cannot update '{id_}', it is in the library!")
+            if id_ not in elements:
+                raise ValueError(f"Cannot update '{id_}', it is not in the model!")
+        # the derived entries of the new relationships go on their endpoints
+        gone = set(removed)
+        for data in (*added.values(), *changed.values()):
+            if "relatedElement" not in data:
+                continue
+            for endpoint in (*data["source"], *data["target"]):
+                endpoint_id = endpoint["@id"]
+                if endpoint_id in library or endpoint_id in added or (
+                    endpoint_id in elements and endpoint_id not in gone
+                ):
+                    continue
+                raise ValueError(
+                    f"Relationship '{data['@id']}' relates '{endpoint_id}',"
+                    " which is not in the model!"
+                )
 
-        self.ownedRelationship = [
-            relationship
-            for relationship in owned
-            if relationship._is_relationship
-        ]
+        delta = ModelDelta(
+            added=set(added),
+            changed=set(changed),
+            removed=set(removed),
+        )
 
-        by_metatype = defaultdict(list)
-        for element in elements.values():
-            by_metatype[element._metatype].append(element)
-        self.ownedMetatype = dict(by_metatype)
+        # take out the old versions of the changed and removed elements...
+        outdated = [elements[id_] for id_ in (*changed, *removed)]
+        for id_ in (*changed, *removed):
+            self._content_hashes.pop(id_, None)
+        self._subtree_hashes = {}
+        for element in outdated:
+            self._unindex_element(element, delta)
+        for id_ in removed:
+            del elements[id_]
+        self._remove_owned(outdated, delta)
 
-    def _add_relationships(self):
-        """Adds relationships to elements"""
-        relationship_mapper = {
-            "through": ("source", "target"),
-            "reverse": ("target", "source"),
-        }
-        # TODO: make this more elegant...  maybe.
-        for relationship in self.all_relationships.values():
-            endpoints = {
-                endpoint_type: [
-                    self.elements[endpoint["@id"]]
-                    for endpoint in relationship._data[endpoint_type]
+        # ... and put in the new versions of the added and changed elements
+        for id_, data in changed.items():
+            element = elements[id_]
+            element.__class__ = get_element_class(data.get("@type"))
+            element._data = data
+            element.__post_init__()
+        model = ref(self) if self._gc_frozen else self
+        for id_, data in added.items():
+            elements[id_] = Element(_data=data, _model=model)
+            self.id_encoder.encode(id_)
+
+        updated = [elements[id_] for id_ in (*changed, *added)]
+        self._add_owned_elements(updated, delta)
+        for element in updated:
+            self._index_element(element, delta)
+        self._add_element_properties(updated)
+
+        delta.related -= delta.added | delta.changed | delta.removed
+        # the hashes of the updated elements were dropped already
+        self._generation += 1
+        return delta
+
+    def _remove_owned(self, outdated: List["Element"], delta: ModelDelta):
+        """Remove elements from the owned elements, relationships and metatypes"""
+        outdated_ids = {element._id for element in outdated}
+        for element in outdated:
+            self.all_relationships.pop(element._id, None)
+            self.all_non_relationships.pop(element._id, None)
+            delta.metatypes.add(element._metatype)
+
+        for metatype in {element._metatype for element in outdated}:
+            remaining = [
+                element
+                for element in self.ownedMetatype[metatype]
+                if element._id not in outdated_ids
+            ]
+            if remaining:
+                self.ownedMetatype[metatype] = remaining
+            else:
+                del self.ownedMetatype[metatype]
+
+        if any(element.get_owner() is None for element in outdated):
+            self.ownedElement = ListGetter(
+                element
+                for element in self.ownedElement
+                if element._id not in outdated_ids
+            )
+            self.ownedRelationship = [
+                relationship
+                for relationship in self.ownedRelationship
+                if relationship._id not in outdated_ids
+            ]
+
+    def _add_owned_elements(self, updated: List["Element"], delta: ModelDelta):
+        """Add elements to the owned elements, relationships and metatypes"""
+        for element in updated:
+            if element._is_relationship:
+                self.all_relationships[element._id] = element
+            else:
+                self.all_non_relationships[element._id] = element
+            self.ownedMetatype.setdefault(element._metatype, []).append(element)
+            delta.metatypes.add(element._metatype)
+
+            if element.get_owner() is None:
+                if element._is_relationship:
+                    self.ownedRelationship.append(element)
+                else:
+                    self.ownedElement.append(element)
+
+    def _unindex_element(self, element: "Element", delta: ModelDelta):
+        """Remove the references and relationship entries of an element"""
+        id_, elements, library = element._id, self.elements, self._library_ids()
+        if self._referrers is not None:
+            for key, referenced_id in iter_references(element._data):
+                by_id = self._referrers.get(key, {})
+                referrer_ids = [
+                    referrer_id
+                    for referrer_id in by_id.get(referenced_id, ())
+                    if referrer_id != id_
                 ]
-                for endpoint_type in ("source", "target")
-            }
-            metatype = relationship._metatype
-            for direction, (key1, key2) in relationship_mapper.items():
-                endpts1, endpts2 = endpoints[key1], endpoints[key2]
-                for endpt1 in endpts1:
-                    for endpt2 in endpts2:
-                        endpt1._derived[f"{direction}{metatype}"] += [
-                            {"@id": endpt2._data["@id"]}
-                        ]
+                if referrer_ids:
+                    by_id[referenced_id] = referrer_ids
+                else:
+                    by_id.pop(referenced_id, None)
+                delta.related.add(referenced_id)
+
+        if not element._is_relationship:
+            return
+        data = element._data
+        for endpoint_id, key, other_id in relationship_entries(
+            metatype=data["@type"],
+            sources=[endpoint["@id"] for endpoint in data["source"]],
+            targets=[endpoint["@id"] for endpoint in data["target"]],
+        ):
+            if endpoint_id not in elements or endpoint_id in library:
+                continue
+            derived = elements[endpoint_id]._thaw_derived()
+            if {"@id": other_id} in derived.get(key, ()):
+                derived[key].remove({"@id": other_id})
+            if not derived.get(key):
+                derived.pop(key, None)
+            delta.related.add(endpoint_id)
+
+    def _index_element(self, element: "Element", delta: ModelDelta):
+        """Add the references and relationship entries of an element"""
+        id_, elements, library = element._id, self.elements, self._library_ids()
+        if self._referrers is not None:
+            for key, referenced_id in iter_references(element._data):
+                by_id = self._referrers.setdefault(key, {})
+                referrer_ids = by_id.get(referenced_id)
+                if type(referrer_ids) is not list:
+                    referrer_ids = by_id[referenced_id] = list(referrer_ids or ())
+                referrer_ids.append(id_)
+                delta.related.add(referenced_id)
+
+        if not element._is_relationship:
+            return
+        data = element._data
+        for endpoint_id, key, other_id in relationship_entries(
+            metatype=data["@type"],
+            sources=[endpoint["@id"] for endpoint in data["source"]],
+            targets=[endpoint["@id"] for endpoint in data["target"]],
+        ):
+            if endpoint_id in library:
+                continue
+            elements[endpoint_id]._thaw_derived()[key] += [{"@id": other_id}]
+            delta.related.add(endpoint_id)
+
+    def _add_relationships(self, scans: List["ElementScan"]):
+        """Adds relationships to elements"""
+        elements, library = self.elements, self._library_ids()
+        for _, _, _, entries in scans:
+            for endpoint_id, key, other_id in entries or ():
+                if endpoint_id in library:
+                    continue
+                derived = elements[endpoint_id]._derived
+                derived[intern(key)] += [{"@id": intern(other_id)}]
+
+    def _library_ids(self) -> Container[str]:
+        """The ids of the library elements, which are left as they are"""
+        return () if self.library is None else self.library.elements
+
+
+# An element's id, metatype, owner id and, for a relationship, the derived
+# entries it adds
+ElementScan = Tuple[str, str, str, List[Tuple[str, str, str]]]
+
+CHUNKS_PER_PROCESS = 4
+
+
+def scan_elements(elements: List[Dict]) -> List[ElementScan]:
+    """Get what the model needs from the data of some elements, to add their
+    owned elements, metatypes and relationships
+    """
+    scans = []
+    for data in elements:
+        entries = None
+        if "relatedElement" in data:
+            entries = list(relationship_entries(
+                metatype=data["@type"],
+                sources=[endpoint["@id"] for endpoint in data["source"]],
+                targets=[endpoint["@id"] for endpoint in data["target"]],
+            ))
+        scans.append((data["@id"], data["@type"], get_owner_id(data), entries))
+    return scans
+
+
+def scan_model_elements(
+    elements: List[Dict],
+    processes: int = None,
+) -> List[ElementScan]:
+    """Scan element data, splitting it into chunks scanned by a pool of
+    processes if `processes` is more than one
+    """
+    if not processes or processes < 2 or len(elements) < 2:
+        return scan_elements(elements)
+
+    chunk_size = -(-len(elements) // (processes * CHUNKS_PER_PROCESS))
+    bounds = [
+        (start, start + chunk_size)
+        for start in range(0, len(elements), chunk_size)
+    ]
+    # forked processes get the data with the rest of the memory, from the
+    # pool's initializer, so only send them where their chunks are
+    if get_start_method() == "fork":
+        function, chunks = _scan_forked_chunk, bounds
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_set_forked_elements,
+            initargs=(elements,),
+        )
+    else:
+        function = scan_elements
+        chunks = [elements[start:stop] for start, stop in bounds]
+        pool = ProcessPoolExecutor(max_workers=processes)
+    with pool:
+        return [
+            scan
+            for scans in pool.map(function, chunks)
+            for scan in scans
+        ]
+
+
+# the elements of the load that forked a worker process, set in the worker only
+_FORKED_ELEMENTS: List[Dict] = None
+
+
+def _set_forked_elements(elements: List[Dict]):
+    global _FORKED_ELEMENTS
+    _FORKED_ELEMENTS = elements
+
+
+def _scan_forked_chunk(bounds: Tuple[int, int]) -> List[ElementScan]:
+    start, stop = bounds
+    return scan_elements(_FORKED_ELEMENTS[start:stop])
+
+
+RELATIONSHIP_DIRECTIONS = {
+    "through": ("source", "target"),
+    "reverse": ("target", "source"),
+}
+
+
+def relationship_entries(
+    metatype: str,
+    sources: List[str],
+    targets: List[str],
+) -> Iterator[Tuple[str, str, str]]:
+    """Get the derived entries a relationship adds to its endpoints, as
+    (endpoint id, derived key, other endpoint id) tuples
+    """
+    endpoints = dict(source=sources, target=targets)
+    # TODO: make this more elegant...  maybe.
+    for direction, (key1, key2) in RELATIONSHIP_DIRECTIONS.items():
+        key = f"{direction}{metatype}"
+        for endpt1 in endpoints[key1]:
+            for endpt2 in endpoints[key2]:
+                yield endpt1, key, endpt2
+
+
+def check_element_data(data: dict):
+    """Check that element data has what the model indexes it by"""
+    if not isinstance(data, dict) or "@id" not in data or "@type" not in data:
+        raise ValueError(f"{data!r} is not element data, with an '@id' and '@type'!")
+    if not isinstance(data.get("ownedElement"), (list, tuple)):
+        raise ValueError(f"Element '{data['@id']}' has no 'ownedElement' list!")
+    if "relatedElement" in data:
+        for key in ("source", "target"):
+            if not isinstance(data.get(key), (list, tuple)):
+                raise ValueError(f"Relationship '{data['@id']}' has no '{key}' list!")
+
+
+def iter_references(data: dict) -> Iterator[Tuple[str, str]]:
+    """Get the (attribute name, referenced id) of every reference in element data"""
+    for key, value in data.items():
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, dict) and "@id" in item:
+                    yield key, item["@id"]
+        elif isinstance(value, dict) and "@id" in value:
+            yield key, value["@id"]
+
+
+def is_owner_key(key: str) -> bool:
+    """Whether an attribute references an owner of the element, e.g.,
+    "owner", "owningType", "membershipOwningNamespace" or "featuringType"
+    """
+    return (
+        key in ("owner", "featuringType")
+        or key.startswith("owning")
+        or "Owning" in key
+    )
+
+
+def get_owner_id(data: dict) -> str:
+    """Get the id of the owner of an element from its data"""
+    for key in ("owner", "owningRelatedElement", "owningRelationship"):
+        owner_id = (data.get(key) or {}).get("@id")
+        if owner_id is not None:
+            return owner_id
+    return None
+
+
+def _intern_reference(item: Any):
+    """Intern the id in a reference (i.e., `{"@id": ...}`) to another element"""
+    if type(item) is dict and "@id" in item:
+        item["@id"] = intern(item["@id"])
 
 
-@dataclass(repr=False)
 class Element:
-    """A SysML v2 Element"""
+    """A SysML v2 Element
+
+    Elements are slotted, and their derived data and instances are only
+    created when first needed, to keep large models compact.
+    """
 
-    _data: dict
-    _model: Model
+    __slots__ = (
+        "_data",
+        "__model",
+        "_is_abstract",
+        "_is_relationship",
+        "__derived",
+        "__instances",
+        "__resolved",  # (model generation, resolved values by key), or None
+    )
 
-    _derived: Dict[str, List] = field(default_factory=lambda: defaultdict(list))
-    _instances: List["Element"] = field(default_factory=list)
-    _is_relationship: bool = False
+    def __new__(cls, _data: dict = None, *args, **kwargs):
+        if cls is Element and _data is not None:
+            cls = get_element_class(_data.get("@type"))
+        return super().__new__(cls)
+
+    def __init__(
+        self,
+        _data: dict,
+        _model: Model,
+        _derived: Dict[str, List] = None,
+        _instances: List["Element"] = None,
+        _is_relationship: bool = False,
+    ):
+        self._data = _data
+        self.__model = _model
+        self.__derived = _derived
+        self.__instances = _instances
+        self.__resolved = None
+        self._is_relationship = _is_relationship
+        self.__post_init__()
 
     def __post_init__(self):
-        self._is_abstract = bool(self._data.get("isAbstract"))
-        self._is_relationship = "relatedElement" in self._data
-        self._data["ownedElement"] = ListGetter(self._data["ownedElement"])
+        # Share the strings for ids and metatypes across elements
+        data = self._data
+        for value in data.values():
+            if type(value) is list:
+                for item in value:
+                    _intern_reference(item)
+            else:
+                _intern_reference(value)
+        for key in ("@id", "@type"):
+            if isinstance(data.get(key), str):
+                data[key] = intern(data[key])
+
+        self._is_abstract = bool(data.get("isAbstract"))
+        self._is_relationship = "relatedElement" in data
+        data["ownedElement"] = ListGetter(data["ownedElement"])
+
+    @property
+    def _model(self) -> Model:
+        model = self.__model
+        if type(model) is ReferenceType:
+            # see `Model.freeze_gc`
+            return model()
+        return model
+
+    @_model.setter
+    def _model(self, model: Union[Model, ReferenceType]):
+        self.__model = model
+
+    @property
+    def _derived(self) -> Dict[str, List]:
+        derived = self.__derived
+        if type(derived) is FrozenDict:
+            return derived
+        # the derived data may be changed through here
+        self.__resolved = None
+        if derived is None:
+            derived = self.__derived = defaultdict(list)
+        return derived
+
+    @_derived.setter
+    def _derived(self, derived: Dict[str, List]):
+        self.__resolved = None
+        self.__derived = derived
+
+    @property
+    def _instances(self) -> List["Element"]:
+        if self.__instances is None:
+            self.__instances = []
+        return self.__instances
+
+    @_instances.setter
+    def _instances(self, instances: List["Element"]):
+        self.__instances = instances
+
+    def _freeze(self, references: Dict[str, FrozenDict]):
+        """Make the data and derived data of the element read-only"""
+        if type(self._data) is not FrozenDict:
+            self._data = freeze_data(self._data, references)
+        derived = self.__derived
+        if derived is None:
+            # so getting `_derived` doesn't make a dict that could be changed
+            self.__derived = NO_DERIVED
+        elif type(derived) is not FrozenDict:
+            self.__derived = FrozenDict({
+                key: freeze_data(list(values), references)
+                for key, values in derived.items()
+            })
+
+    def _thaw_derived(self) -> Dict[str, List]:
+        """Get the derived data of the element, made changeable if it was frozen"""
+        derived = self._derived
+        if type(derived) is FrozenDict:
+            derived = self.__derived = defaultdict(list, {
+                key: list(values)
+                for key, values in derived.items()
+            })
+        return derived
+
+    def _copy(self, model: Model) -> "Element":
+        """Make a copy of the element for another model, sharing its data"""
+        element = Element.__new__(self.__class__)
+        element.__setstate__((
+            self._data,
+            model,
+            self.__derived,
+            None,
+            self._is_abstract,
+            self._is_relationship,
+        ))
+        return element
+
+    def __reduce__(self):
+        # the generated classes can't be found by name when unpickling
+        return _new_element, (self._data.get("@type"),), self.__getstate__()
+
+    def __getstate__(self):
+        return (
+            self._data,
+            self._model,
+            self.__derived,
+            self.__instances,
+            self._is_abstract,
+            self._is_relationship,
+        )
+
+    def __setstate__(self, state):
+        (
+            self._data,
+            self.__model,
+            self.__derived,
+            self.__instances,
+            self._is_abstract,
+            self._is_relationship,
+        ) = state
+        self.__resolved = None
+
+    def __eq__(self, other):
+        if not isinstance(other, Element):
+            return NotImplemented
+        return self is other or (
+            self._model is other._model and self._data == other._data
+        )
 
     def __dir__(self):
         return sorted(
             list(super().__dir__()) + [
                 key
-                for key in [*self._data, *self._derived]
+                for key in [*self._data, *(self.__derived or ())]
                 if key.isidentifier()
             ]
         )
@@ -241,9 +1479,30 @@ class Element:
             raise exc
 
     def __getitem__(self, key: str) -> Any:
+        """Get the value of a key, with references resolved to their elements.
+
+        The resolved values are kept, so getting a key again returns the
+        same value, until the model or the element's derived data changes.
+        """
+        model = self.__model
+        if type(model) is ReferenceType:
+            model = model()
+        # the generation and its values are swapped in at once, so no thread
+        # sees the values of one generation with another
+        cache, generation = self.__resolved, model._generation
+        if cache is None or cache[0] != generation:
+            resolved = {}
+            self.__resolved = generation, resolved
+        else:
+            resolved = cache[1]
+            if key in resolved:
+                return resolved[key]
+        value = resolved[key] = self.__resolve(key)
+        return value
+
+    def __resolve(self, key: str) -> Any:
         found = False
-        for source in ("_data", "_derived"):
-            source = self.__getattribute__(source)
+        for source in (self._data, self.__derived or {}):
             if key in source:
                 found = True
                 item = source[key]
@@ -277,24 +1536,46 @@ class Element:
     def _id(self) -> str:
         return self._data["@id"]
 
+    @property
+    def _code(self) -> int:
+        """The dense integer code of the element's id in its model"""
+        return self._model.id_encoder.encode(self._data["@id"])
+
     @property
     def _metatype(self) -> str:
         return self._data["@type"]
 
+    @property
+    def _content_hash(self) -> bytes:
+        """A hash of the element's data"""
+        model = self._model
+        if not model._subtree_hashes:
+            model._add_hashes()
+        return model._content_hashes[self._id]
+
+    @property
+    def _subtree_hash(self) -> bytes:
+        """A hash of the element's data and, recursively, of its owned elements"""
+        model = self._model
+        if not model._subtree_hashes:
+            model._add_hashes()
+        return model._subtree_hashes[self._id]
+
+    @property
+    def _keys(self) -> List[str]:
+        """The keys of the element's data and derived data"""
+        return [*self._data, *(self.__derived or ())]
+
     @property
     def relationships(self) -> Dict[str, Any]:
-        return {key: self[key] for key in self._derived}
+        return {key: self[key] for key in self.__derived or ()}
 
     def get_owner(self) -> "Element":
-        data = self._data
-        owner_id = None
-        for key in ("owner", "owningRelatedElement", "owningRelationship"):
-            owner_id = (data.get(key) or {}).get("@id")
-            if owner_id is not None:
-                break
+        """Get the owner of the element, or None if it is not in the model"""
+        owner_id = get_owner_id(self._data)
         if owner_id is None:
             return None
-        return self._model.elements[owner_id]
+        return self._model.elements.get(owner_id)
 
     def create(data: dict, model: Model) -> "Element":
         return Element(_data=data, _model=model)
@@ -311,6 +1592,64 @@ class Element:
             return item
 
 
+# The generated subclasses of Element, by metatype
+ELEMENT_CLASSES: Dict[str, type] = {}
+
+
+def get_element_class(metatype: str) -> type:
+    """Get the Element subclass generated for a metatype"""
+    element_class = ELEMENT_CLASSES.get(metatype)
+    if element_class is None:
+        if not isinstance(metatype, str) or not metatype.isidentifier():
+            return Element
+        element_class = ELEMENT_CLASSES.setdefault(metatype, type(
+            metatype,
+            (Element,),
+            dict(__slots__=(), __module__=__name__, __doc__=f"A SysML v2 {metatype}"),
+        ))
+    return element_class
+
+
+def add_element_properties(element_class: type, keys: Iterable[str]):
+    """Add a property for each key to an Element subclass, unless the class
+    already has an attribute with that name
+    """
+    for key in keys:
+        if key.isidentifier() and not hasattr(element_class, key):
+            setattr(element_class, key, _element_property(key))
+
+
+def _element_property(key: str) -> property:
+    def get(self):
+        try:
+            return self[key]
+        except KeyError:
+            # not all elements of a metatype have the same keys
+            raise AttributeError(f"No '{key}' in {self}") from None
+
+    return property(get, doc=f"The '{key}' of the element")
+
+
+def _new_element(metatype: str) -> Element:
+    return Element.__new__(get_element_class(metatype))
+
+
+@contextmanager
+def collector_paused(paused: bool = True):
+    """Disable the garbage collector in the block, if `paused`"""
+    gc_was_enabled = paused and gc.isenabled()
+    if gc_was_enabled:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+INSTANCES_LOCK = Lock()
+
+
 @dataclass
 class Instance:
     """An M0 instantiation of an element"""
@@ -318,10 +1657,12 @@ class Instance:
     element: Element
     name: str = ""
 
-    def __post_init__(self, *args, **kwargs):
-        super().__post_init__(*args, **kwargs)
+    def __post_init__(self):
         element = self.element
-        element._instances += [self]
+        # the elements of a sealed model may be instantiated from many threads
+        with INSTANCES_LOCK:
+            element._instances += [self]
+            number = len(element._instances)
         if not self.name:
-            name = element.name or element._id
-            self.name = f"{name}#{len(element._instances)}"
+            name = element._data.get("name") or element._id
+            self.name = f"{name}#{number}"
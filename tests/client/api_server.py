@@ -0,0 +1,209 @@
+"""A stand-in for the SysML v2 API server, serving one commit of elements"""
+import json
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import sleep
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import pytest
+
+from pymbe.async_client import AsyncSysML2Client
+from pymbe.client import SysML2Client
+
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+COMMIT_ID = "00000000-0000-0000-0000-000000000002"
+PROJECT_NAME = "Stand-in Project Sun Oct 18 12:00:00 UTC 2026"
+DEFAULT_PAGE_SIZE = 100
+ELEMENT_COUNT = 2_000
+
+
+def make_elements(count: int) -> List[Dict]:
+    """Make a flat commit of `count` part definitions"""
+    return [
+        {
+            "@id": f"element-{index:07d}",
+            "@type": "PartDefinition",
+            "name": f"Part {index}",
+            "owner": None,
+            "ownedElement": [],
+            "ownedRelationship": [],
+        }
+        for index in range(count)
+    ]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: "StandInServer"
+
+    # keep the connections alive between requests, without waiting on small writes
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.most_in_flight = max(
+                self.server.most_in_flight, self.server.in_flight
+            )
+        try:
+            sleep(self.server.latency)
+            self._get()
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def _get(self):
+        url = urlparse(self.path)
+        project = {"@id": PROJECT_ID, "@type": "Project", "name": PROJECT_NAME}
+        if url.path == "/projects":
+            return self._send([project])
+        if url.path == f"/projects/{PROJECT_ID}":
+            return self._send(project)
+        if url.path == f"/projects/{PROJECT_ID}/commits":
+            return self._send([{"@id": COMMIT_ID, "@type": "Commit"}])
+        elements_path = f"/projects/{PROJECT_ID}/commits/{COMMIT_ID}/elements"
+        if url.path.startswith(elements_path + "/"):
+            position = self.server.positions.get(url.path[len(elements_path) + 1:])
+            if position is None:
+                return self.send_error(404)
+            self.server.requests.append(self.path)
+            return self._send(self.server.elements[position])
+        if url.path != elements_path:
+            return self.send_error(404)
+
+        with self.server.lock:
+            self.server.attempts.append(self.path)
+            inject = self.server.inject
+            failure = inject and inject(len(self.server.attempts))
+        if failure == "drop":
+            self.close_connection = True
+            return
+        if failure == "truncate":
+            self.send_response(200)
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            self.wfile.write(b'[{"@id": ')
+            self.close_connection = True
+            return
+        if isinstance(failure, tuple):
+            status, headers = failure
+            self.send_response(status)
+            for header, value in {**headers, "Content-Length": "0"}.items():
+                self.send_header(header, value)
+            return self.end_headers()
+        if failure:
+            return self.send_error(failure)
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        size = int(query.get("page[size]", DEFAULT_PAGE_SIZE))
+        start = 0
+        if "page[after]" in query:
+            start = self.server.positions[query["page[after]"]] + 1
+        page = self.server.elements[start:start + size]
+        links = {}
+        if start + size < len(self.server.elements):
+            query["page[after]"] = page[-1]["@id"]
+            links["next"] = f"{self.server.url}{url.path}?{urlencode(query, safe='[]')}"
+        self.server.requests.append(self.path)
+        self._send(page, links)
+
+    def _send(self, data, links: Dict[str, str] = None):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if links:
+            self.send_header(
+                "Link",
+                ", ".join(f'<{url}>; rel="{rel}"' for rel, url in links.items()),
+            )
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serve pages of elements, linking each page to the next with a cursor.
+
+    If it is set, `inject` is called with the number of every attempt to get
+    a page, and can make it fail, by returning an HTTP status, or an HTTP
+    status and a dict of headers, or "drop" to close the connection, or
+    "truncate" to send only part of the page.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        elements: List[Dict],
+        latency: float = 0,
+        handler=StandInHandler,
+    ):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.elements = elements
+        self.positions = {
+            element["@id"]: index for index, element in enumerate(elements)
+        }
+        self.latency = latency
+        self.lock = Lock()
+        self.requests = []
+        self.attempts = []
+        self.inject: Optional[Callable[[int], Optional[object]]] = None
+        self.connections = 0
+        self.in_flight = self.most_in_flight = 0
+
+    def reset(self, latency: float = 0):
+        with self.lock:
+            self.latency = latency
+            self.requests.clear()
+            self.attempts.clear()
+            self.inject = None
+            self.connections = 0
+            self.most_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def __enter__(self):
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+
+@pytest.fixture(scope="module")
+def api_server() -> StandInServer:
+    with StandInServer(make_elements(ELEMENT_COUNT)) as server:
+        yield server
+
+
+def _client_kwargs(server: StandInServer, kwargs: dict) -> dict:
+    host_url, host_port = server.url.rsplit(":", 1)
+    kwargs.setdefault("cache", None)
+    return dict(kwargs, host_url=host_url, host_port=int(host_port))
+
+
+def connect(server: StandInServer, **kwargs) -> SysML2Client:
+    """Make a client of the server, with its project and commit selected"""
+    client = SysML2Client(**_client_kwargs(server, kwargs))
+    client.selected_project = PROJECT_ID
+    client.selected_commit = COMMIT_ID
+    return client
+
+
+def connect_async(server: StandInServer, **kwargs) -> AsyncSysML2Client:
+    """Make an asyncio client of the server"""
+    return AsyncSysML2Client(**_client_kwargs(server, kwargs))
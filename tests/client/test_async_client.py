@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+import requests
+
+from pymbe.async_client import AsyncSysML2Client
+from pymbe.download import RetryPolicy
+from pymbe.local.cache import CommitCache
+from pymbe.model import Model
+
+from tests.client.api_server import (
+    COMMIT_ID,
+    PROJECT_ID,
+    PROJECT_NAME,
+    StandInServer,
+    api_server,
+    connect_async,
+    make_elements,
+)
+
+
+def test_load_commit(api_server):
+    async def load():
+        async with connect_async(api_server, page_size=200) as client:
+            return await client.load_commit(PROJECT_ID, COMMIT_ID)
+
+    api_server.reset()
+    model = asyncio.run(load())
+    assert isinstance(model, Model)
+    assert list(model.elements) == [element["@id"] for element in api_server.elements]
+    assert model.name == f"{PROJECT_NAME} ({api_server.url})"
+    assert all("label" in element._derived for element in model.elements.values())
+    assert len(api_server.requests) == 10
+
+
+def test_load_commits_with_a_limit(api_server):
+    async def load():
+        async with connect_async(api_server, page_size=200, max_loads=8) as client:
+            return await client.load_commits([(PROJECT_ID, COMMIT_ID)] * 12, limit=3)
+
+    api_server.reset(latency=0.02)
+    models = asyncio.run(load())
+    assert len(models) == 12
+    assert len({id(model) for model in models}) == 12
+    assert all(len(model.elements) == len(api_server.elements) for model in models)
+    assert 1 < api_server.most_in_flight <= 3
+
+
+def test_repeat_loads_come_from_the_cache(api_server, tmp_path):
+    async def load():
+        cache = CommitCache(tmp_path)
+        async with connect_async(api_server, page_size=200, cache=cache) as client:
+            return await client.load_commits([(PROJECT_ID, COMMIT_ID)] * 2, limit=1)
+
+    api_server.reset()
+    first, second = asyncio.run(load())
+    assert len(api_server.requests) == 10
+    assert list(first.elements) == list(second.elements)
+
+
+def test_cached_commits_load_offline(tmp_path):
+    async def load(server: StandInServer, name: str = None):
+        # if it needs the server once it is gone, it fails after a single attempt
+        async with connect_async(
+            server,
+            page_size=200,
+            cache=CommitCache(tmp_path),
+            retry_policy=RetryPolicy(attempts=1),
+        ) as client:
+            return await client.load_commit(PROJECT_ID, COMMIT_ID, name=name)
+
+    with StandInServer(make_elements(300)) as server:
+        online = asyncio.run(load(server))
+    offline = asyncio.run(load(server))
+    named = asyncio.run(load(server, name="Named"))
+
+    assert offline.name == online.name == f"{PROJECT_NAME} ({server.url})"
+    assert named.name == f"Named ({server.url})"
+    assert list(offline.elements) == list(online.elements)
+
+
+def test_failed_loads_raise(api_server):
+    async def load():
+        async with connect_async(api_server, page_size=200) as client:
+            return await client.load_commit(PROJECT_ID, "not a commit")
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(load())
+    with pytest.raises(ValueError):
+        AsyncSysML2Client(max_loads=0, cache=None)
+
+    async def load_beyond_the_threads():
+        async with connect_async(api_server, max_loads=2) as client:
+            return await client.load_commits([(PROJECT_ID, COMMIT_ID)], limit=3)
+
+    with pytest.raises(ValueError):
+        asyncio.run(load_beyond_the_threads())
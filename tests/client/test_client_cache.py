@@ -0,0 +1,77 @@
+import pytest
+
+from pymbe.local.cache import CommitCache
+
+from tests.client.api_server import api_server, connect, make_elements
+
+
+KEY = ("http://localhost:9000", "project", "commit", "/elements?page[size]=2")
+
+
+def test_repeat_loads_come_from_the_cache(api_server, tmp_path):
+    client = connect(api_server, page_size=100, cache=CommitCache(tmp_path))
+    api_server.reset()
+    client._download_elements()
+    assert len(api_server.requests) == 20
+
+    # a new client, as after a restart, doesn't need the server
+    client = connect(api_server, page_size=100, cache=CommitCache(tmp_path))
+    api_server.reset()
+    client._download_elements()
+    assert api_server.requests == []
+    assert list(client.model.elements) == [
+        element["@id"] for element in api_server.elements
+    ]
+
+    client.page_size = 200
+    client._download_elements()
+    assert len(api_server.requests) == 10
+
+
+def test_cache_is_content_addressed_and_compressed(tmp_path):
+    cache = CommitCache(tmp_path)
+    data = make_elements(100)
+    cache.put(KEY, data, "next page")
+    cache.put(KEY[:3] + ("/elements?page[size]=100",), data)
+
+    assert cache.get(KEY) == (data, "next page")
+    assert cache.get(KEY[:3] + ("/elements?page[size]=100",)) == (data, None)
+    assert cache.get(KEY[:2] + ("another commit", KEY[3])) is None
+    assert len(list(cache._iter_contents())) == 1
+    assert 0 < cache.size < len(str(data)) / 4
+
+
+def test_cache_evicts_the_least_recently_used(tmp_path):
+    pages = {
+        f"/elements?page[after]={index}": make_elements(index + 10)
+        for index in range(3)
+    }
+    cache = CommitCache(tmp_path)
+    for page, data in pages.items():
+        cache.put(KEY[:3] + (page,), data)
+    sizes = [stat.st_size for _, stat in cache._iter_contents()]
+
+    cache = CommitCache(tmp_path, max_size=cache.size - min(sizes))
+    first, *others = pages
+    assert cache.get(KEY[:3] + (first,)) is not None
+    cache.put(KEY[:3] + ("/elements?page[after]=3",), make_elements(13))
+
+    assert cache.size <= cache.max_size
+    assert cache.get(KEY[:3] + (first,)) is not None
+    assert sum(cache.get(KEY[:3] + (page,)) is None for page in others) >= 1
+
+    cache.clear()
+    assert cache.size == 0
+    assert cache.get(KEY[:3] + (first,)) is None
+
+
+def test_corrupted_entries_are_dropped(tmp_path):
+    cache = CommitCache(tmp_path)
+    cache.put(KEY, make_elements(10))
+    (path, _), = cache._iter_contents()
+    path.write_bytes(b"not compressed")
+
+    assert cache.get(KEY) is None
+    assert not cache._key_path(KEY).exists()
+    with pytest.raises(ValueError):
+        CommitCache(tmp_path, max_size=-1)
@@ -0,0 +1,53 @@
+from time import perf_counter
+
+import pytest
+
+from pymbe.download import Downloader
+
+from tests.client.api_server import api_server, connect
+
+
+def test_element_lookups_are_concurrent_and_in_order(api_server):
+    client = connect(api_server, concurrency=8)
+    api_server.reset(latency=0.02)
+    element_ids = [element["@id"] for element in api_server.elements[::-20]]
+
+    elements = client._get_elements_by_id(element_ids)
+    assert [element["@id"] for element in elements] == element_ids
+    assert 1 < api_server.most_in_flight <= 8
+    assert api_server.connections <= 8
+
+
+def test_connections_are_reused(api_server):
+    client = connect(api_server, page_size=100, concurrency=1)
+    api_server.reset()
+
+    assert len(client._get_elements_from_server()) == len(api_server.elements)
+    assert len(api_server.requests) == 20
+    assert api_server.connections == 1
+
+
+def test_next_page_is_requested_while_a_page_is_used(api_server):
+    client = connect(api_server, page_size=100)
+    api_server.reset(latency=0.05)
+
+    pages = client._iter_pages(client.elements_url)
+    next(pages)
+    deadline = perf_counter() + 5
+    while len(api_server.requests) < 2 and perf_counter() < deadline:
+        pass
+    assert len(api_server.requests) == 2
+    pages.close()
+
+
+def test_changing_the_concurrency(api_server):
+    client = connect(api_server, concurrency=2)
+    downloader = client._downloader
+    assert downloader.concurrency == 2
+
+    client.concurrency = 6
+    assert client._downloader is not downloader
+    assert client._downloader.concurrency == 6
+
+    with pytest.raises(ValueError):
+        Downloader(concurrency=0)
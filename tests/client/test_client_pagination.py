@@ -0,0 +1,59 @@
+from time import monotonic, sleep
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from tests.client.api_server import StandInServer, connect, make_elements
+
+
+ELEMENT_COUNT = 200_000
+
+
+@pytest.fixture(scope="module")
+def api_server():
+    with StandInServer(make_elements(ELEMENT_COUNT)) as server:
+        yield server
+
+
+def test_download_follows_next_links(api_server):
+    client = connect(api_server, page_size=5000)
+    api_server.requests.clear()
+    client._download_elements()
+
+    assert len(api_server.requests) == ELEMENT_COUNT // 5000
+    assert len(client.model.elements) == ELEMENT_COUNT
+    assert list(client.model.elements) == [
+        element["@id"] for element in api_server.elements
+    ]
+    assert client.model.elements["element-0199999"].name == "Part 199999"
+
+
+def wait_for_requests(server: StandInServer, count: int, timeout: float = 10) -> int:
+    """Wait for the server to get `count` requests, and then a moment for any more"""
+    deadline = monotonic() + timeout
+    while len(server.requests) < count and monotonic() < deadline:
+        sleep(0.01)
+    sleep(0.1)
+    return len(server.requests)
+
+
+def test_pages_are_retrieved_as_they_are_used(api_server):
+    client = connect(api_server, page_size=1000)
+    api_server.requests.clear()
+    pages = client._iter_pages(client.elements_url)
+
+    # each page is used while the one after it is downloading, and no further
+    assert len(next(pages)) == 1000
+    assert wait_for_requests(api_server, 2) == 2
+    assert len(next(pages)) == 1000
+    assert wait_for_requests(api_server, 3) == 3
+    query = parse_qs(urlparse(api_server.requests[1]).query)
+    assert query["page[after]"] == ["element-0000999"]
+    pages.close()
+
+
+def test_download_with_the_server_page_size(api_server):
+    client = connect(api_server, paginate=False)
+    with pytest.warns(UserWarning):
+        elements = client._get_elements_from_server()
+    assert len(elements) == ELEMENT_COUNT
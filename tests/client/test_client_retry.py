@@ -0,0 +1,107 @@
+from email.utils import formatdate
+from time import time
+
+import pytest
+import requests
+
+from pymbe.download import RetryPolicy
+from pymbe.local.cache import CommitCache
+
+from tests.client.api_server import api_server, connect
+
+
+FAST_RETRIES = RetryPolicy(attempts=4, backoff=0.001, max_backoff=0.01)
+
+
+@pytest.mark.parametrize("failure", [503, "drop", "truncate"])
+def test_failed_pages_are_retried(api_server, failure):
+    client = connect(api_server, page_size=100, retry_policy=FAST_RETRIES)
+    api_server.reset()
+    api_server.inject = lambda attempt: failure if attempt % 3 else None
+
+    client._download_elements()
+    assert list(client.model.elements) == [
+        element["@id"] for element in api_server.elements
+    ]
+    assert len(api_server.attempts) == 3 * len(api_server.requests) == 3 * 20
+
+
+def test_pages_are_not_retried_forever(api_server):
+    client = connect(api_server, page_size=100, retry_policy=FAST_RETRIES)
+    api_server.reset()
+    api_server.inject = lambda attempt: 503
+
+    with pytest.raises(requests.HTTPError):
+        client._download_elements()
+    assert len(api_server.attempts) == FAST_RETRIES.attempts
+
+    api_server.reset()
+    api_server.inject = lambda attempt: 404
+    with pytest.raises(requests.HTTPError):
+        client._download_elements()
+    assert len(api_server.attempts) == 1
+
+
+def test_long_retry_afters_are_not_cut_short(api_server):
+    client = connect(api_server, page_size=100, retry_policy=FAST_RETRIES)
+    api_server.reset()
+    api_server.inject = lambda attempt: (503, {"Retry-After": "60"})
+
+    with pytest.raises(requests.HTTPError, match="retry after 60"):
+        client._download_elements()
+    assert len(api_server.attempts) == 1
+
+    api_server.reset()
+    # a Retry-After in reach is waited out
+    api_server.inject = lambda attempt: attempt < 2 and (429, {"Retry-After": "0"})
+    client._download_elements()
+    assert len(api_server.attempts) == 21
+
+
+def test_download_resumes_after_the_last_good_page(api_server, tmp_path):
+    client = connect(
+        api_server,
+        page_size=100,
+        cache=CommitCache(tmp_path),
+        retry_policy=FAST_RETRIES,
+    )
+    api_server.reset()
+    # the connection goes down for good after 7 pages
+    api_server.inject = lambda attempt: "drop" if attempt > 7 else None
+    with pytest.raises(requests.HTTPError):
+        client._download_elements()
+    assert len(api_server.requests) == 7
+
+    api_server.reset()
+    client._download_elements()
+    assert len(api_server.requests) == 20 - 7
+    assert len(client.model.elements) == len(api_server.elements)
+
+
+def test_retry_policy():
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    for attempt in range(10):
+        assert 0 <= policy.wait(attempt) <= min(5, 2 ** attempt)
+    assert policy.wait(0, retry_after="3") == 3
+    assert policy.wait(0, retry_after="-3") == 0
+    assert policy.wait(0, retry_after=formatdate(time() + 3, usegmt=True)) <= 3
+    assert policy.wait(0, retry_after=formatdate(time() - 60, usegmt=True)) == 0
+    assert policy.wait(0, retry_after="not a date") <= 1
+    # the server is never asked again sooner than it says
+    assert policy.wait(0, retry_after="60") is None
+    assert policy.wait(0, retry_after=formatdate(time() + 60, usegmt=True)) is None
+
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+    with pytest.raises(ValueError):
+        RetryPolicy(backoff=-1)
+
+
+def test_changing_the_retry_policy(api_server):
+    client = connect(api_server)
+    downloader = client._downloader
+    assert downloader.retry == RetryPolicy()
+
+    client.retry_policy = FAST_RETRIES
+    assert client._downloader is not downloader
+    assert client._downloader.retry is FAST_RETRIES
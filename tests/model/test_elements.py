@@ -0,0 +1,192 @@
+import pytest
+
+from pymbe.model import Element, ListGetter, Model
+
+from tests.conftest import kerbal_client
+
+
+def test_elements_are_compact(kerbal_client):
+    model = kerbal_client.model
+    for element in model.elements.values():
+        assert not hasattr(element, "__dict__")
+        assert element._id is model.elements[element._id]._data["@id"]
+
+    leaves = [
+        element
+        for element in model.elements.values()
+        if element._Element__derived is None
+    ]
+    assert leaves, "derived data should only be made for related elements"
+    assert all(element._Element__instances is None for element in leaves)
+
+
+def test_element_interns_ids_and_metatypes(kerbal_client):
+    model = kerbal_client.model
+    element = next(iter(model.elements.values()))
+
+    data = {
+        key: value
+        for key, value in element._data.items()
+        if key != "ownedElement"
+    }
+    data["@id"] = "".join(element._id)
+    data["ownedElement"] = [
+        {"@id": "".join(ref["@id"])} for ref in element._data["ownedElement"]
+    ]
+    twin = Element(_data=data, _model=model)
+
+    assert twin._id is element._id
+    assert twin._metatype is element._metatype
+    for ref, twin_ref in zip(element._data["ownedElement"], twin._data["ownedElement"]):
+        assert ref["@id"] is twin_ref["@id"]
+    assert twin == element
+
+
+def test_element_lazy_derived_and_instances(kerbal_client):
+    model = kerbal_client.model
+    element = next(iter(model.elements.values()))
+    element._derived = None
+    element._instances = None
+
+    assert element.relationships == {}
+    assert element._Element__derived is None
+    element._derived["label"] = "a label"
+    assert element.label == "a label"
+
+    element._instances += ["instance"]
+    assert element._instances == ["instance"]
+
+
+def test_list_getter_name_index(kerbal_client):
+    by_name = {
+        element._data["name"]: element
+        for element in kerbal_client.model.elements.values()
+        if element._data.get("name")
+    }
+    first, second, third, *_ = by_name.values()
+    items = ListGetter([first, second])
+
+    assert items[0] is first and items[-1] is second
+    assert items[:1] == [first]
+    assert items[first.name] is first
+
+    items.append(third)
+    assert items[third.name] is third
+
+    items[1] = third
+    assert items[third.name] is third
+    with pytest.raises(TypeError):
+        items[second.name]
+
+    items.remove(third)
+    assert items[third.name] is third
+    items.remove(third)
+    with pytest.raises(TypeError):
+        items[third.name]
+
+    items.extend([second])
+    assert items[second.name] is second
+
+
+def test_id_encoder(kerbal_client, tmp_path):
+    model = kerbal_client.model
+    encoder = model.id_encoder
+    assert len(encoder) == len(model.elements)
+    codes = sorted(element._code for element in model.elements.values())
+    assert codes == list(range(len(encoder)))
+    assert encoder.decode_all(encoder.encode_all(model.elements)) == list(
+        model.elements
+    )
+
+    loaded = Model.load_snapshot(model.save_snapshot(tmp_path / "model.snapshot"))
+    assert all(
+        loaded.elements[id_]._code == element._code
+        for id_, element in model.elements.items()
+    )
+
+    removed = next(iter(model.all_relationships.values()))
+    data = dict(removed._data, **{"@id": "new id"})
+    model.apply_delta(added=[data], removed=[removed._id])
+    assert model.elements["new id"]._code == len(encoder) - 1 == len(model.elements)
+    assert encoder.decode(removed._code) == removed._id
+
+
+def test_metatype_classes(kerbal_client, tmp_path):
+    model = kerbal_client.model
+    for element in model.elements.values():
+        element_class = type(element)
+        assert issubclass(element_class, Element)
+        assert element_class.__name__ == element._metatype
+        for key in element._keys:
+            if key.isidentifier() and key not in dir(Element):
+                assert isinstance(element_class.__dict__[key], property)
+                assert getattr(element, key) == element[key]
+
+    element = next(iter(model.elements.values()))
+    assert element._type == element._metatype
+    with pytest.raises(AttributeError):
+        element.notAKey
+
+    # keys missing from some elements of a metatype still raise AttributeError
+    element_class = type(element)
+    keys = [
+        key
+        for key, value in vars(element_class).items()
+        if isinstance(value, property)
+    ]
+    data = {"@id": "another id", "@type": element._metatype, "ownedElement": []}
+    other = Element(_data=data, _model=model)
+    assert type(other) is element_class
+    for key in keys:
+        if key not in data:
+            assert not hasattr(other, key)
+
+    loaded = Model.load_snapshot(model.save_snapshot(tmp_path / "model.snapshot"))
+    assert all(
+        type(loaded.elements[id_]) is type(element)
+        for id_, element in model.elements.items()
+    )
+
+
+def test_resolved_values_are_kept(kerbal_client):
+    model = kerbal_client.model
+    owner = next(
+        element
+        for element in model.elements.values()
+        if len(element._data["ownedElement"]) > 1
+    )
+    owned = owner.ownedElement
+    assert owner["ownedElement"] is owned
+    assert all(isinstance(element, Element) for element in owned)
+
+    # changing the derived data drops the resolved values
+    owner._derived["label"] = "a label"
+    assert owner.ownedElement is not owned
+    assert owner.ownedElement == owned
+
+    # so does changing the model
+    owned = owner.ownedElement
+    removed = next(
+        element
+        for element in owned
+        if not element._data["ownedElement"]
+    )
+    model.apply_delta(removed=[removed._id])
+    assert owner.ownedElement is not owned
+    # the owner's data still references the removed element
+    assert removed._id in owner.ownedElement
+    assert all(element is not removed for element in owner.ownedElement)
+
+
+def test_resolved_values_of_a_reloaded_model(kerbal_client, tmp_path):
+    model = kerbal_client.model.seal()
+    reloaded = Model.load_snapshot(model.save_snapshot(tmp_path / "model.snapshot"))
+    owner = next(
+        element
+        for element in reloaded.elements.values()
+        if element._data["ownedElement"]
+    )
+    assert owner._Element__resolved is None
+    owned = owner.ownedElement
+    generation, resolved = owner._Element__resolved
+    assert generation == reloaded._generation and resolved["ownedElement"] is owned
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from pymbe.model import FrozenDict, Model, TupleGetter, get_owner_id
+
+from tests.conftest import kerbal_client
+
+
+def load_copy(model: Model) -> Model:
+    data = [element._data for element in model.elements.values()]
+    return Model.load(json.loads(json.dumps(data)))
+
+
+def test_freeze(kerbal_client):
+    model = load_copy(kerbal_client.model)
+    expected = {
+        id_: json.dumps(element._data) for id_, element in model.elements.items()
+    }
+    model.freeze()
+
+    for id_, element in model.elements.items():
+        assert type(element._data) is FrozenDict
+        assert json.dumps(element._data) == expected[id_]
+        assert isinstance(element._data["ownedElement"], TupleGetter)
+
+    element = next(
+        element
+        for element in model.all_non_relationships.values()
+        if element._data.get("owner")
+    )
+    with pytest.raises(TypeError):
+        element._data["name"] = "renamed"
+    with pytest.raises(TypeError):
+        element._data["owner"]["@id"] = "another id"
+    with pytest.raises(TypeError):
+        del model.elements[element._id]
+    with pytest.raises(ValueError):
+        model.apply_delta(removed=[element._id])
+
+    # references to the same element share their data
+    referrers = model.referrers(element.get_owner(), via="owner")
+    assert len(referrers) > 1
+    assert all(
+        referrer._data["owner"] is element._data["owner"]
+        for referrer in referrers
+    )
+
+    named = [owned for owned in model.ownedElement if owned._data.get("name")]
+    for owned in named:
+        name = owned._data["name"]
+        assert model.ownedElement[name]._data["name"] == name
+
+
+def test_edit(kerbal_client):
+    model = load_copy(kerbal_client.model).freeze()
+    renamed = next(
+        element
+        for element in model.all_non_relationships.values()
+        if element._data.get("owner")
+    )
+    owners = {get_owner_id(element._data) for element in model.elements.values()}
+    removed = next(
+        relationship
+        for relationship in model.all_relationships.values()
+        if relationship._id not in owners
+    )
+    data = json.loads(json.dumps(renamed._data))
+    data["name"] = "renamed"
+
+    edited = model.edit(changed=[data], removed=[removed._id])
+    assert removed._id not in edited.elements and removed._id in model.elements
+    assert edited._frozen and edited is not model
+    assert edited.elements[renamed._id].name == "renamed"
+    assert model.elements[renamed._id].name != "renamed"
+
+    unchanged = [
+        id_
+        for id_ in model.elements
+        if id_ != renamed._id and id_ in edited.elements
+    ]
+    assert all(
+        edited.elements[id_]._data is model.elements[id_]._data for id_ in unchanged
+    )
+    assert all(edited.elements[id_]._model is edited for id_ in edited.elements)
+
+    reloaded = load_copy(edited)
+    for id_, element in reloaded.elements.items():
+        assert edited.elements[id_]._content_hash == element._content_hash
+        assert {
+            key: sorted(ref["@id"] for ref in refs)
+            for key, refs in edited.elements[id_]._derived.items()
+        } == {
+            key: sorted(ref["@id"] for ref in refs)
+            for key, refs in element._derived.items()
+        }
+
+
+def test_edit_owner(kerbal_client):
+    model = load_copy(kerbal_client.model).freeze()
+    owner = next(
+        element
+        for element in model.all_non_relationships.values()
+        if element._data["ownedElement"] and element._data.get("name")
+    )
+    owned_ids = [owned["@id"] for owned in owner._data["ownedElement"]]
+    model.referrers(owner)
+    data = json.loads(json.dumps(owner._data))
+    data["name"] = "renamed"
+
+    edited = model.edit(changed=[data])
+    assert edited.elements[owner._id].name == "renamed"
+    assert model.elements[owner._id].name != "renamed"
+    for owned_id in owned_ids:
+        assert edited.referrers(owned_id, via="ownedElement") == [
+            edited.elements[owner._id]
+        ]
+        assert model.referrers(owned_id, via="ownedElement") == [owner]
+        assert edited.elements[owned_id].get_owner() is edited.elements[owner._id]
+
+
+def test_frozen_snapshot(kerbal_client, tmp_path):
+    model = load_copy(kerbal_client.model).freeze()
+    loaded = Model.load_snapshot(model.save_snapshot(tmp_path / "model.snapshot"))
+    assert loaded._frozen
+    for id_, element in model.elements.items():
+        assert loaded.elements[id_]._data == element._data
+        assert type(loaded.elements[id_]._data) is FrozenDict
@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+from pymbe.columns import COLUMNS
+from pymbe.query.metamodel_navigator import feature_multiplicity
+
+from tests.conftest import kerbal_client
+
+
+def test_to_columns(kerbal_client):
+    model = kerbal_client.model
+    columns = model.to_columns()
+    assert set(columns) == set(COLUMNS)
+    assert all(len(column) == len(model.elements) for column in columns.values())
+
+    metatypes = sorted(model.ownedMetatype)
+    for row, element in enumerate(model.elements.values()):
+        assert columns["index"][row] == element._code
+        assert metatypes[columns["metatype"][row]] == element._metatype
+        owner = element.get_owner()
+        assert columns["owner"][row] == (-1 if owner is None else owner._code)
+        assert columns["name"][row] == element._data.get("name")
+        assert columns["isAbstract"][row] == element._is_abstract
+
+        types = element._data.get("type") or []
+        types = types if isinstance(types, list) else [types]
+        type_code = model.id_encoder.encode(types[0]["@id"]) if types else -1
+        assert columns["type"][row] == type_code
+
+        if element._data.get("multiplicity"):
+            for bound in ("lower", "upper"):
+                value = columns[bound][row]
+                if math.isfinite(value):
+                    assert value == feature_multiplicity(element, bound)
+        else:
+            assert np.isnan(columns["lower"][row]) and np.isnan(columns["upper"][row])
+
+    owned_counts = np.bincount(
+        columns["owner"][columns["owner"] >= 0],
+        minlength=len(model.id_encoder),
+    )
+    busiest = np.argmax(owned_counts)
+    busiest = model.elements[model.id_encoder.decode(busiest)]
+    assert owned_counts[busiest._code] == sum(
+        element.get_owner() is busiest
+        for element in model.elements.values()
+    )
+
+
+def test_to_columns_as_frame(kerbal_client):
+    pytest.importorskip("pandas")
+
+    model = kerbal_client.model
+    frame = model.to_columns(as_frame=True)
+    assert list(frame.index) == [element._code for element in model.elements.values()]
+    assert list(frame["metatype"]) == [
+        element._metatype for element in model.elements.values()
+    ]
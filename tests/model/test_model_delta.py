@@ -0,0 +1,203 @@
+import json
+
+import pytest
+
+from pymbe.model import Model, get_owner_id
+
+from tests.conftest import kerbal_client
+
+
+def plain_data(model: Model) -> list:
+    data = [element._data for element in model.elements.values()]
+    return json.loads(json.dumps(data))
+
+
+def as_sets(model: Model) -> dict:
+    def ids(elements):
+        return {element._id for element in elements}
+
+    return dict(
+        data={id_: element._data for id_, element in model.elements.items()},
+        derived={
+            id_: {
+                key: sorted(ref["@id"] for ref in refs)
+                for key, refs in element._derived.items()
+            }
+            for id_, element in model.elements.items()
+        },
+        relationships=set(model.all_relationships),
+        non_relationships=set(model.all_non_relationships),
+        owned=ids(model.ownedElement),
+        owned_relationships=ids(model.ownedRelationship),
+        metatypes={
+            metatype: ids(elements)
+            for metatype, elements in model.ownedMetatype.items()
+        },
+        referrers={
+            id_: ids(model.referrers(id_))
+            for id_ in model.elements
+        },
+    )
+
+
+def test_apply_delta(kerbal_client):
+    full = plain_data(kerbal_client.model)
+    owners = {get_owner_id(data) for data in full}
+    relationships = [
+        data
+        for data in full
+        if "relatedElement" in data and data["@id"] not in owners
+    ]
+    endpoints = {ref["@id"] for data in relationships for ref in data["relatedElement"]}
+    unrelated = [
+        data
+        for data in full
+        if "relatedElement" not in data and data["@id"] not in endpoints | owners
+    ]
+
+    added = relationships[:5] + unrelated[:2]
+    removed = [data["@id"] for data in relationships[5:10]]
+    changed = [dict(data, name="renamed") for data in full[20:25] if data not in added]
+    changed_ids = {data["@id"] for data in changed}
+
+    base = Model.load([data for data in full if data not in added])
+    target = Model.load(
+        [
+            dict(data, name="renamed") if data["@id"] in changed_ids else data
+            for data in full
+            if data["@id"] not in removed
+        ]
+    )
+
+    element = base.elements[changed[0]["@id"]]
+    delta = base.apply_delta(added=added, changed=changed, removed=removed)
+
+    assert base.elements[element._id] is element
+    assert element.name == "renamed"
+    assert as_sets(base) == as_sets(target)
+
+    assert delta.added == {data["@id"] for data in added}
+    assert delta.changed == changed_ids
+    assert delta.removed == set(removed)
+    endpoints = {
+        ref["@id"]
+        for data in relationships[:10]
+        for ref in data["relatedElement"]
+    }
+    assert endpoints - delta.removed - delta.added - delta.changed <= delta.related
+    assert delta.invalidated >= delta.related | delta.added
+
+
+def test_apply_delta_rejects_unknown_ids(kerbal_client):
+    model = kerbal_client.model
+    data = next(iter(model.elements.values()))._data
+    with pytest.raises(ValueError):
+        model.apply_delta(added=[data])
+    with pytest.raises(ValueError):
+        model.apply_delta(removed=["not an id"])
+    with pytest.raises(ValueError):
+        model.apply_delta(changed=[data], removed=[data["@id"]])
+
+
+def test_apply_delta_to_owners(kerbal_client):
+    full = plain_data(kerbal_client.model)
+    owners = {get_owner_id(data) for data in full} - {None}
+    renamed = next(data for data in full if data["@id"] in owners and data.get("name"))
+    # remove an owning element, and the relationships that need it
+    removed = {next(data["@id"] for data in full[::-1] if data["@id"] in owners)}
+    while True:
+        needing = {
+            data["@id"]
+            for data in full
+            if any(ref["@id"] in removed for ref in data.get("relatedElement", ()))
+        }
+        if needing <= removed:
+            break
+        removed |= needing
+    assert renamed["@id"] not in removed
+
+    base = Model.load(json.loads(json.dumps(full)))
+    target = Model.load(
+        [
+            dict(data, name="renamed") if data["@id"] == renamed["@id"] else data
+            for data in json.loads(json.dumps(full))
+            if data["@id"] not in removed
+        ]
+    )
+    base.referrers(renamed["@id"])
+
+    delta = base.apply_delta(changed=[dict(renamed, name="renamed")], removed=removed)
+    assert delta.changed == {renamed["@id"]} and delta.removed == removed
+    assert base.elements[renamed["@id"]].name == "renamed"
+    assert as_sets(base) == as_sets(target)
+
+
+def test_failed_delta_leaves_the_model_untouched(kerbal_client):
+    model = Model.load(plain_data(kerbal_client.model))
+    model.referrers(next(iter(model.elements)))
+    expected = as_sets(model)
+    relationship = next(iter(model.all_relationships.values()))
+    broken = {
+        key: value for key, value in relationship._data.items() if key != "source"
+    }
+    owner = next(
+        element
+        for element in model.elements.values()
+        if element._data["ownedElement"]
+    )
+
+    with pytest.raises(ValueError):
+        model.apply_delta(changed=[broken], removed=[owner._id])
+    with pytest.raises(ValueError):
+        model.apply_delta(added=[{"name": "no id"}], removed=[owner._id])
+    assert as_sets(model) == expected
+    assert owner._id in model.elements
+
+
+def test_delta_is_checked_before_it_is_applied(kerbal_client):
+    model = Model.load(plain_data(kerbal_client.model))
+    model.referrers(next(iter(model.elements)))
+    expected = as_sets(model)
+    owner = next(
+        element
+        for element in model.all_non_relationships.values()
+        if element._data["ownedElement"] and model.referrers(element)
+    )
+    relationship = next(iter(model.all_relationships.values()))
+    unowned = {
+        key: value
+        for key, value in owner._data.items()
+        if key != "ownedElement"
+    }
+    unrelated = json.loads(json.dumps(relationship._data))
+    unrelated["@id"] = "new relationship"
+    unrelated["target"] = [{"@id": "not an element"}]
+    removed_endpoint = relationship._data["source"][0]["@id"]
+    related = dict(json.loads(json.dumps(relationship._data)), **{"@id": "new"})
+
+    with pytest.raises(ValueError):
+        model.apply_delta(changed=[unowned])
+    with pytest.raises(ValueError):
+        model.apply_delta(added=[unrelated])
+    with pytest.raises(ValueError):
+        model.apply_delta(added=[related], removed=[removed_endpoint])
+    assert as_sets(model) == expected
+
+
+def test_apply_delta_with_an_unknown_owner(kerbal_client):
+    model = Model.load(plain_data(kerbal_client.model))
+    orphan = next(
+        data
+        for data in plain_data(kerbal_client.model)
+        if "relatedElement" not in data and get_owner_id(data) is not None
+    )
+    orphan = dict(orphan, **{"@id": "orphan", "owner": {"@id": "not an element"}})
+    orphan["ownedElement"] = []
+
+    # as when it is loaded, the element is a root, without an owner
+    model.apply_delta(added=[orphan])
+    assert model.elements["orphan"].get_owner() is None
+    assert model.ownedElement[-1] is model.elements["orphan"]
+    assert "orphan" in model.all_non_relationships
+    reloaded = Model.load(plain_data(model))
+    assert as_sets(reloaded)["owned"] == as_sets(model)["owned"]
@@ -0,0 +1,74 @@
+import json
+
+from pymbe.diff import diff_models, hash_data, hash_elements
+from pymbe.model import Model, get_owner_id
+
+from tests.conftest import kerbal_client
+
+
+def test_hash_data_is_canonical():
+    data = {"@id": "a", "name": "A", "ownedElement": [{"@id": "b"}]}
+    reordered = dict(reversed(list(data.items())))
+    assert hash_data(data) == hash_data(reordered)
+    assert hash_data(data) != hash_data(dict(data, name="B"))
+
+
+def test_diff_models(kerbal_client):
+    old_model = kerbal_client.model
+    new_data = json.loads(
+        json.dumps([element._data for element in old_model.elements.values()])
+    )
+    by_id = {data["@id"]: data for data in new_data}
+
+    owned = [data for data in new_data if data.get("owner")]
+    renamed, moved = owned[0], owned[1]
+    renamed["name"] = "renamed"
+    old_owner = moved["owner"]["@id"]
+    new_owner = next(id_ for id_ in by_id if id_ != old_owner)
+    moved["owner"] = {"@id": new_owner}
+
+    removed = owned[2]["@id"]
+    del by_id[removed]
+    by_id["new"] = dict(owned[3], **{"@id": "new"})
+
+    diff = diff_models(old_model, by_id)
+    assert diff.added == ["new"]
+    assert diff.removed == [removed]
+    assert diff.changed == [renamed["@id"]]
+    assert diff.moved == {moved["@id"]: (old_owner, new_owner)}
+    assert diff.attributes[renamed["@id"]] == {
+        "name": (old_model.elements[renamed["@id"]]._data["name"], "renamed"),
+    }
+    assert diff.attributes[moved["@id"]]["owner"] == (
+        {"@id": old_owner},
+        {"@id": new_owner},
+    )
+    assert get_owner_id(by_id[moved["@id"]]) == new_owner
+
+    assert not diff_models(old_model, old_model)
+
+
+def test_diff_models_reuses_hashes(kerbal_client):
+    model = kerbal_client.model
+    copy = json.loads(
+        json.dumps({id_: element._data for id_, element in model.elements.items()})
+    )
+
+    old_hashes, new_hashes = {}, {}
+    assert not diff_models(model, copy, old_hashes=old_hashes, new_hashes=new_hashes)
+    assert old_hashes == new_hashes == hash_elements(model)
+
+    # with every hash known, the element data is not compared
+    copy = {id_: {} for id_ in copy}
+    assert not diff_models(model, copy, old_hashes=old_hashes, new_hashes=new_hashes)
+
+
+def test_diff_models_fills_in_the_content_hashes(kerbal_client):
+    data = {id_: element._data for id_, element in kerbal_client.model.elements.items()}
+    old = Model.load(json.loads(json.dumps(list(data.values()))))
+    new = json.loads(json.dumps(data))
+
+    assert not diff_models(old, new, old_hashes={}, new_hashes={})
+    assert not old._content_hashes
+    assert not diff_models(old, new)
+    assert old._content_hashes == hash_elements(old)
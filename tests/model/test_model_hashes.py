@@ -0,0 +1,61 @@
+import json
+
+from pymbe.diff import hash_data
+from pymbe.model import Model
+
+from tests.conftest import kerbal_client
+
+
+def owner_chain(element) -> list:
+    chain = []
+    owner = element.get_owner()
+    while owner is not None:
+        chain.append(owner)
+        owner = owner.get_owner()
+    return chain
+
+
+def test_hashes_are_stable(kerbal_client):
+    model = kerbal_client.model
+    data = [element._data for element in model.elements.values()]
+    copy = Model.load(json.loads(json.dumps(data)))
+    for id_, element in model.elements.items():
+        assert element._content_hash == hash_data(element._data)
+        assert element._content_hash == copy.elements[id_]._content_hash
+        assert element._subtree_hash == copy.elements[id_]._subtree_hash
+
+
+def test_subtree_hashes_roll_up(kerbal_client):
+    model = kerbal_client.model
+    leaf = max(
+        model.all_non_relationships.values(),
+        key=lambda element: len(owner_chain(element)),
+    )
+    chain = owner_chain(leaf)
+    assert chain, "expected an owned element"
+
+    subtree_hashes = {
+        id_: element._subtree_hash for id_, element in model.elements.items()
+    }
+    content_hashes = {
+        id_: element._content_hash for id_, element in model.elements.items()
+    }
+    model.apply_delta(changed=[dict(leaf._data, name="renamed")])
+
+    affected = {leaf._id} | {owner._id for owner in chain}
+    for id_, element in model.elements.items():
+        assert (element._subtree_hash != subtree_hashes[id_]) == (id_ in affected)
+        assert (element._content_hash != content_hashes[id_]) == (id_ == leaf._id)
+
+
+def test_hashes_after_invalidate(kerbal_client):
+    data = [element._data for element in kerbal_client.model.elements.values()]
+    model = Model.load(json.loads(json.dumps(data)))
+    element = next(iter(model.all_non_relationships.values()))
+    owner = element.get_owner() or element
+    content_hash, subtree_hash = element._content_hash, owner._subtree_hash
+
+    element._data["name"] = "renamed"
+    model.invalidate()
+    assert element._content_hash == hash_data(element._data) != content_hash
+    assert owner._subtree_hash != subtree_hash
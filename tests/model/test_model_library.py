@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from pymbe.graph import SysML2LabeledPropertyGraph
+from pymbe.model import Element, Model, iter_references, relationship_entries
+
+from tests.conftest import kerbal_client
+
+
+def make_library(model: Model) -> Model:
+    """Make a library of part of a model"""
+    root = next(
+        element
+        for element in model.all_non_relationships.values()
+        if element.get_owner() is not None and element._data["ownedElement"]
+    )
+    return model.slice([root]).freeze()
+
+
+def load_with_library(model: Model, library: Model) -> Model:
+    data = [element._data for element in model.elements.values()]
+    data = json.loads(json.dumps(data))
+    return Model.load(data, library=library)
+
+
+def test_library_fall_through(kerbal_client):
+    model = kerbal_client.model
+    library = make_library(model)
+    derived = {
+        id_: {key: list(values) for key, values in element._derived.items()}
+        for id_, element in library.elements.items()
+    }
+    user = load_with_library(model, library)
+
+    assert len(user.elements) == len(model.elements) - len(library.elements)
+    assert not set(user.elements.keys()) & set(library.elements)
+    for id_, element in library.elements.items():
+        assert id_ in user.elements
+        assert user.elements[id_] is element
+        assert user.elements.get(id_) is element
+        assert element._model is library
+    assert user.elements.get("not an id") is None
+    with pytest.raises(KeyError):
+        user.elements["not an id"]
+
+    # references to the library resolve to the library elements...
+    referrers = [
+        (element, key)
+        for element in user.elements.values()
+        for key, referenced_id in iter_references(element._data)
+        if referenced_id in library.elements
+    ]
+    assert referrers
+    for element, key in referrers:
+        values = element[key]
+        for value in values if isinstance(values, (list, tuple)) else [values]:
+            assert isinstance(value, Element)
+
+    # ... which are not changed by the user models
+    for id_, element in library.elements.items():
+        assert {
+            key: list(values) for key, values in element._derived.items()
+        } == derived[id_]
+    with pytest.raises(ValueError):
+        user.apply_delta(removed=[next(iter(library.elements))])
+
+
+def test_library_models_freeze_and_snapshot(kerbal_client, tmp_path):
+    library = make_library(kerbal_client.model)
+    user = load_with_library(kerbal_client.model, library)
+    library_id = next(iter(library.elements))
+
+    user.freeze()
+    assert user.elements[library_id] is library.elements[library_id]
+    with pytest.raises(TypeError):
+        user.elements[library_id] = None
+
+    edited = user.edit()
+    assert edited.elements[library_id] is library.elements[library_id]
+
+
+def test_library_is_not_in_the_snapshots(kerbal_client, tmp_path):
+    library = make_library(kerbal_client.model)
+    user = load_with_library(kerbal_client.model, library)
+    library_id = next(iter(library.elements))
+    snapshot = user.save_snapshot(tmp_path / "user.snapshot")
+
+    first, second = (Model.load_snapshot(snapshot, library=library) for _ in range(2))
+    assert first.library is second.library is library
+    for reloaded in (first, second):
+        assert reloaded.elements[library_id] is library.elements[library_id]
+        assert list(reloaded.elements) == list(user.elements)
+
+    with pytest.raises(ValueError):
+        Model.load_snapshot(snapshot)
+    with pytest.raises(ValueError):
+        Model.load_snapshot(snapshot, library=make_library(user))
+
+
+def test_library_elements_miss_user_relationship_entries(kerbal_client):
+    model = kerbal_client.model
+    library = make_library(model)
+    user = load_with_library(model, library)
+
+    # the derived entries of the user relationships are not added to the
+    # shared library...
+    entries = [
+        (endpoint_id, key, other_id)
+        for relationship in user.all_relationships.values()
+        for endpoint_id, key, other_id in relationship_entries(
+            metatype=relationship._metatype,
+            sources=[endpoint["@id"] for endpoint in relationship._data["source"]],
+            targets=[endpoint["@id"] for endpoint in relationship._data["target"]],
+        )
+        if endpoint_id in library.elements
+    ]
+    assert entries
+    for endpoint_id, key, other_id in entries:
+        assert {"@id": other_id} in model.elements[endpoint_id]._derived[key]
+        library_entries = library.elements[endpoint_id]._derived.get(key, ())
+        assert {"@id": other_id} not in library_entries
+
+    # ... but the graph has the library endpoints, with their data
+    lpg = SysML2LabeledPropertyGraph(model=user)
+    for endpoint_id, _, _ in entries:
+        assert lpg.nodes[endpoint_id] == library.elements[endpoint_id]._data
@@ -0,0 +1,269 @@
+import gc
+import gzip
+import io
+import json
+import lzma
+import weakref
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pymbe.instrumentation import LoadReport
+from pymbe.local.lazy import build_index, convert_to_jsonl
+from pymbe.local.readers import iter_json_array
+from pymbe.local.snapshot import save_snapshot
+from pymbe.model import Model, collector_paused
+
+from tests.conftest import FIXTURES, kerbal_client
+
+
+KERBAL_FILE = FIXTURES / "Kerbal.json"
+
+COMPRESSORS = {
+    ".json": lambda data: data,
+    ".json.gz": gzip.compress,
+    ".json.xz": lzma.compress,
+}
+
+
+def assert_same_model(model1: Model, model2: Model):
+    assert list(model1.elements) == list(model2.elements)
+    for id_, element in model1.elements.items():
+        other = model2.elements[id_]
+        assert element._data == other._data
+        assert dict(element._derived) == dict(other._derived)
+    assert [element._id for element in model1.ownedElement] == [
+        element._id for element in model2.ownedElement
+    ]
+    assert {
+        metatype: [element._id for element in elements]
+        for metatype, elements in model1.ownedMetatype.items()
+    } == {
+        metatype: [element._id for element in elements]
+        for metatype, elements in model2.ownedMetatype.items()
+    }
+
+
+@pytest.mark.parametrize("suffix", tuple(COMPRESSORS))
+@pytest.mark.parametrize("stream", (False, True))
+def test_load_from_file(tmp_path, suffix, stream):
+    filepath = tmp_path / f"Kerbal{suffix}"
+    filepath.write_bytes(COMPRESSORS[suffix](KERBAL_FILE.read_bytes()))
+
+    assert_same_model(
+        Model.load_from_file(KERBAL_FILE),
+        Model.load_from_file(filepath, stream=stream),
+    )
+
+
+@pytest.mark.parametrize("chunk_size", (1, 3, 1024))
+def test_iter_json_array(chunk_size):
+    text = ' [ 1 , 2.5e3, "a]" ,[1,[2]], {"x": "}"}, null, true ] '
+    items = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+    assert items == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ("[1 2]", "[1,", "{}", "[1,]"))
+def test_iter_json_array_malformed(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+def test_snapshot_round_trip(tmp_path, kerbal_client):
+    model = kerbal_client.model
+    snapshot = model.save_snapshot(tmp_path / "Kerbal.snapshot")
+
+    reloaded = Model.load_snapshot(snapshot)
+    assert_same_model(model, reloaded)
+    assert all(element._model is reloaded for element in reloaded.elements.values())
+    for elements in reloaded.ownedMetatype.values():
+        assert all(element is reloaded.elements[element._id] for element in elements)
+
+
+def test_failed_snapshots_leave_no_file(tmp_path, kerbal_client):
+    jsonl_file = convert_to_jsonl(KERBAL_FILE, tmp_path / "Kerbal.jsonl")
+    build_index(jsonl_file)
+    files = set(tmp_path.iterdir())
+    with Model.load_lazy(jsonl_file) as lazy_model:
+        with pytest.raises(ValueError):
+            lazy_model.save_snapshot(tmp_path / "Lazy.snapshot")
+        with pytest.raises(TypeError):
+            save_snapshot(lazy_model, tmp_path / "Lazy.snapshot")
+    assert set(tmp_path.iterdir()) == files
+
+    # and a snapshot that was there is kept
+    snapshot = kerbal_client.model.save_snapshot(tmp_path / "Kerbal.snapshot")
+    with pytest.raises(TypeError):
+        save_snapshot(lazy_model, snapshot)
+    assert_same_model(kerbal_client.model, Model.load_snapshot(snapshot))
+    assert set(tmp_path.iterdir()) == files | {snapshot}
+
+
+def test_snapshot_rejects_other_files():
+    with pytest.raises(ValueError):
+        Model.load_snapshot(KERBAL_FILE)
+
+
+@pytest.mark.parametrize("use_mmap", (False, True))
+def test_lazy_model(tmp_path, use_mmap):
+    jsonl_file = convert_to_jsonl(KERBAL_FILE, tmp_path / "Kerbal.jsonl")
+    model = Model.load_from_file(KERBAL_FILE)
+
+    lazy_model = Model.load_lazy(jsonl_file, use_mmap=use_mmap)
+    elements = lazy_model.elements
+    assert len(elements) == len(model.elements)
+    assert elements.loaded == len(lazy_model.ownedElement)
+
+    feature_id = next(iter(model.all_non_relationships))
+    assert elements.get_metatype(feature_id) == model.elements[feature_id]._metatype
+    metatype = model.elements[feature_id]._metatype
+    features = lazy_model.ownedMetatype[metatype]
+    assert len(features) == len(model.ownedMetatype[metatype])
+    assert elements.loaded == len(lazy_model.ownedElement)
+    assert features[-1]._id == model.ownedMetatype[metatype][-1]._id
+    assert elements.loaded == len(lazy_model.ownedElement) + 1
+
+    assert_same_model(model, lazy_model)
+    assert elements.loaded == len(model.elements)
+    lazy_model.close()
+    assert elements._file.closed
+
+
+def test_lazy_model_is_closed(tmp_path):
+    jsonl_file = convert_to_jsonl(KERBAL_FILE, tmp_path / "Kerbal.jsonl")
+    with Model.load_lazy(jsonl_file, use_mmap=True) as model:
+        file, mapped = model.elements._file, model.elements._mmap
+        assert not file.closed
+    assert file.closed and mapped.closed
+
+    # and when it is collected, if it is never closed
+    file = Model.load_lazy(jsonl_file).elements._file
+    gc.collect()
+    assert file.closed
+
+
+def test_lazy_model_index(tmp_path):
+    jsonl_file = convert_to_jsonl(KERBAL_FILE, tmp_path / "Kerbal.jsonl")
+    index_file = build_index(jsonl_file)
+    index_stamp = index_file.stat().st_mtime_ns
+
+    Model.load_lazy(jsonl_file)
+    assert index_file.stat().st_mtime_ns == index_stamp
+
+    # a changed export makes the index stale, and it is rebuilt
+    lines = jsonl_file.read_text().splitlines()
+    jsonl_file.write_text("\n".join(lines[1:]) + "\n")
+    model = Model.load_lazy(jsonl_file)
+    assert len(model.elements) == len(lines) - 1
+
+
+@pytest.mark.parametrize("processes", [2, 3])
+def test_parallel_load(processes):
+    serial = Model.load_from_file(KERBAL_FILE)
+    parallel = Model.load_from_file(KERBAL_FILE, processes=processes)
+
+    assert_same_model(serial, parallel)
+    assert list(serial.all_relationships) == list(parallel.all_relationships)
+    assert list(serial.all_non_relationships) == list(parallel.all_non_relationships)
+    assert [element._id for element in serial.ownedRelationship] == [
+        element._id for element in parallel.ownedRelationship
+    ]
+    for id_, element in serial.elements.items():
+        for key, values in element._derived.items():
+            for value, other in zip(values, parallel.elements[id_]._derived[key]):
+                assert value["@id"] is other["@id"]
+
+
+def test_parallel_loads_in_threads():
+    files = [KERBAL_FILE, FIXTURES / "Simple Parts Model.json"]
+    with ThreadPoolExecutor(max_workers=len(files)) as pool:
+        models = list(
+            pool.map(lambda file: Model.load_from_file(file, processes=2), files)
+        )
+    for file, model in zip(files, models):
+        assert_same_model(Model.load_from_file(file), model)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_load_report(stream):
+    assert Model.load_from_file(KERBAL_FILE, stream=stream).load_report is None
+
+    model = Model.load_from_file(KERBAL_FILE, stream=stream, instrument=True)
+    report = model.load_report
+    stages = [stage.name for stage in report.stages]
+    if stream:
+        assert stages[0] == "decode and wrap"
+    else:
+        assert stages[:3] == ["decode", "key by id", "wrap"]
+    assert stages[-6:] == [
+        "encode ids", "scan", "owned", "referrers", "relationships", "classes",
+    ]
+
+    assert report["owned"].elements == len(model.elements)
+    assert report["relationships"].elements == len(model.all_relationships)
+    assert all(stage.seconds >= 0 and stage.peak_bytes >= 0 for stage in report.stages)
+    assert report.seconds == sum(stage.seconds for stage in report.stages)
+    assert all(stage in str(report) for stage in stages)
+
+
+def test_load_report_of_a_malformed_file(tmp_path):
+    malformed = tmp_path / "malformed.json"
+    malformed.write_text('[{"@id": "an id", ')
+    with pytest.raises(json.JSONDecodeError):
+        Model.load_from_file(malformed, instrument=True)
+
+    report = LoadReport()
+    with pytest.raises(ZeroDivisionError):
+        with report.stage("failing", count=lambda: 1 / 0):
+            1 / 0
+    assert report["failing"].elements is None
+
+
+def test_gc_frozen_load(tmp_path):
+    model = Model.load_from_file(KERBAL_FILE, gc_frozen=True, instrument=True)
+    try:
+        assert gc.isenabled()
+        assert gc.get_freeze_count() > len(model.elements)
+        assert model.load_report.stages[-1].name == "freeze gc"
+        assert_same_model(Model.load_from_file(KERBAL_FILE), model)
+
+        # the elements reference the model weakly
+        element = next(iter(model.elements.values()))
+        assert element._model is model
+        assert all(
+            type(element._Element__model) is weakref.ref
+            for element in model.elements.values()
+        )
+
+        removed = next(iter(model.all_relationships.values()))
+        model.apply_delta(added=[dict(removed._data, **{"@id": "new id"})])
+        assert type(model.elements["new id"]._Element__model) is weakref.ref
+
+        snapshot = model.save_snapshot(tmp_path / "Kerbal.snapshot")
+        reloaded = Model.load_snapshot(snapshot)
+        assert reloaded._gc_frozen
+        assert all(element._model is reloaded for element in reloaded.elements.values())
+
+        dropped = weakref.ref(reloaded)
+        del reloaded
+        assert dropped() is None
+    finally:
+        gc.unfreeze()
+
+
+def test_gc_frozen_model_leaves_no_garbage_behind():
+    class Cycle:
+        pass
+
+    model = Model.load_from_file(KERBAL_FILE)
+    cycle = Cycle()
+    cycle.self = cycle
+    garbage = weakref.ref(cycle)
+    del cycle
+    try:
+        with collector_paused():
+            model.freeze_gc()
+            assert garbage() is None
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,103 @@
+import pytest
+
+from pymbe.model import Model, get_owner_id, is_owner_key, iter_references
+
+from tests.conftest import kerbal_client
+
+
+def owned_ids(model: Model, id_: str) -> set:
+    """Get the ids of an element and every element it owns, recursively"""
+    owned = {id_}
+    for element in model.elements.values():
+        owner_id, path = element._id, []
+        while owner_id is not None and owner_id not in owned and owner_id not in path:
+            path.append(owner_id)
+            owner_id = get_owner_id(model.elements[owner_id]._data)
+        if owner_id in owned:
+            owned.update(path)
+    return owned
+
+
+def pick_root(model: Model):
+    """Pick an owned element that owns others, but not most of the model"""
+    return next(
+        element
+        for element in model.all_non_relationships.values()
+        if element.get_owner() is not None
+        and 1 < len(owned_ids(model, element._id)) < len(model.elements) // 2
+    )
+
+
+def test_slice(kerbal_client):
+    model = kerbal_client.model
+    root = pick_root(model)
+    sliced = model.slice([root])
+
+    assert isinstance(sliced, Model)
+    assert sliced.elements is not model.elements
+    assert owned_ids(model, root._id) <= set(sliced.elements)
+    assert len(sliced.elements) < len(model.elements)
+    assert list(sliced.elements) == [
+        id_ for id_ in model.elements if id_ in sliced.elements
+    ]
+
+    # every reference, except to the owners, is to an element in the slice
+    for id_, element in sliced.elements.items():
+        assert element._data == model.elements[id_]._data
+        assert element._data is not model.elements[id_]._data
+        for key, referenced_id in iter_references(element._data):
+            if not is_owner_key(key):
+                assert referenced_id in sliced.elements
+    assert root.get_owner()._id not in sliced.elements or any(
+        not is_owner_key(key) and referenced_id == root.get_owner()._id
+        for element in sliced.elements.values()
+        for key, referenced_id in iter_references(element._data)
+    )
+
+
+def test_slice_roots(kerbal_client):
+    model = kerbal_client.model
+    root = pick_root(model)
+    sliced = model.slice([root])
+
+    # the elements whose owners are left out are the roots of the slice
+    roots = [
+        element
+        for element in sliced.elements.values()
+        if get_owner_id(element._data) not in sliced.elements
+    ]
+    assert sliced.elements[root._id] in roots
+    assert all(element.get_owner() is None for element in roots)
+    assert [element._id for element in sliced.ownedElement] == [
+        element._id for element in roots if not element._is_relationship
+    ]
+    assert [element._id for element in sliced.ownedRelationship] == [
+        element._id for element in roots if element._is_relationship
+    ]
+
+    # and stay so as the slice changes
+    data = dict(sliced.elements[root._id]._data, name="renamed")
+    sliced.apply_delta(changed=[data])
+    assert sliced.ownedElement["renamed"] is sliced.elements[root._id]
+
+
+def test_slice_of_frozen_model(kerbal_client):
+    model = kerbal_client.model
+    root = pick_root(model)
+    expected = model.slice([root._id])
+
+    sliced = model.freeze().slice([root._id])
+    assert not sliced._frozen
+    assert list(sliced.elements) == list(expected.elements)
+    assert all(type(element._data) is dict for element in sliced.elements.values())
+
+    sliced.apply_delta(removed=[
+        relationship
+        for relationship in sliced.all_relationships
+        if not sliced.all_relationships[relationship]._data["ownedElement"]
+    ][:1])
+
+
+def test_slice_unknown_root(kerbal_client):
+    with pytest.raises(ValueError):
+        kerbal_client.model.slice(["not an id"])
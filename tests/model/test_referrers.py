@@ -0,0 +1,74 @@
+from pymbe.model import Model
+
+from tests.conftest import kerbal_client
+
+
+def scan_referrers(model: Model, id_: str, via: str = None) -> set:
+    found = set()
+    for element in model.elements.values():
+        for key, value in element._data.items():
+            if via is not None and key != via:
+                continue
+            items = value if isinstance(value, list) else [value]
+            if any(isinstance(item, dict) and item.get("@id") == id_ for item in items):
+                found.add(element._id)
+    return found
+
+
+def test_referrers(kerbal_client):
+    model = kerbal_client.model
+    for element in model.elements.values():
+        referrers = model.referrers(element)
+        assert {referrer._id for referrer in referrers} == scan_referrers(
+            model, element._id
+        )
+        assert len(referrers) == len(set(referrers))
+
+    typed = [
+        element
+        for element in model.elements.values()
+        if element._data.get("type")
+    ]
+    for element in typed:
+        types = element._data["type"]
+        for type_ in types if isinstance(types, list) else [types]:
+            assert element in model.referrers(type_["@id"], via="type")
+
+    for owned in model.ownedElement:
+        assert all(
+            referrer.get_owner() is owned
+            for referrer in model.referrers(owned, via="owner")
+        )
+
+    owners = [
+        element
+        for element in model.elements.values()
+        if element._data["ownedElement"]
+    ]
+    assert owners
+    for owner in owners:
+        for owned in owner._data["ownedElement"]:
+            assert owner in model.referrers(owned["@id"], via="ownedElement")
+        assert model.referrers(owner, via="ownedElement") == [
+            model.elements[id_] for id_ in sorted(
+                scan_referrers(model, owner._id, via="ownedElement"),
+                key=list(model.elements).index,
+            )
+        ]
+    assert model.referrers(typed[0], via="notAnAttribute") == []
+
+
+def test_lazy_model_referrers(kerbal_client, tmp_path):
+    from pymbe.local.lazy import save_jsonl
+
+    model = kerbal_client.model
+    jsonl_file = save_jsonl(
+        (element._data for element in model.elements.values()),
+        tmp_path / "model.jsonl",
+    )
+    lazy_model = Model.load_lazy(jsonl_file)
+    for id_ in list(model.elements)[:50]:
+        assert (
+            [referrer._id for referrer in lazy_model.referrers(id_, via="owner")]
+            == [referrer._id for referrer in model.referrers(id_, via="owner")]
+        )
@@ -0,0 +1,121 @@
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from pymbe.graph import SysML2LabeledPropertyGraph
+from pymbe.label import get_label
+from pymbe.model import FrozenDict, Instance
+from pymbe.query.query import get_types_for_feature, roll_up_upper_multiplicity
+
+from tests.conftest import kerbal_client, kerbal_model_loaded_client
+
+
+THREADS = 16
+PROJECTIONS = ("Part Definition", "Part Typing", "Expanded Banded")
+
+
+@pytest.fixture
+def frequent_switches():
+    """Switch between threads often, so races are more likely to show"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_queries(lpg: SysML2LabeledPropertyGraph) -> dict:
+    model = lpg.model
+    results = {
+        "labels": [get_label(element) for element in model.elements.values()],
+        "owners": [
+            element.get_owner() and element.get_owner()._id
+            for element in model.elements.values()
+        ],
+        "codes": [element._code for element in model.elements.values()],
+        "hashes": [element._subtree_hash for element in model.elements.values()],
+    }
+    for projection in PROJECTIONS:
+        graph = lpg.get_projection(projection)
+        results[projection] = sorted(graph.nodes), sorted(graph.edges)
+    results["types"] = [
+        get_types_for_feature(lpg, element._id)
+        for element in model.elements.values()
+        if "type" in element._data
+    ]
+    results["multiplicities"] = [
+        roll_up_upper_multiplicity(lpg, feature)
+        for feature in model.ownedMetatype.get("PartUsage", ())
+    ]
+    return results
+
+
+def test_seal(kerbal_client):
+    model = kerbal_client.model.seal()
+    assert model._frozen
+    assert len(model._subtree_hashes) == len(model.elements)
+
+    for element in model.elements.values():
+        assert type(element._derived) is FrozenDict
+    with pytest.raises(TypeError):
+        next(iter(model.elements.values()))._derived["label"] = "a label"
+
+
+def test_sealed_model_from_many_threads(kerbal_client, frequent_switches):
+    # the same queries, on another copy of the model, from this thread
+    expected = run_queries(
+        SysML2LabeledPropertyGraph(model=kerbal_model_loaded_client().model)
+    )
+
+    lpg = SysML2LabeledPropertyGraph(model=kerbal_client.model.seal())
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(run_queries, [lpg] * THREADS))
+    assert all(result == expected for result in results)
+
+
+def test_names_from_many_threads(kerbal_client, frequent_switches):
+    model = kerbal_model_loaded_client().model.seal()
+    owned = [
+        element.ownedElement
+        for element in model.elements.values()
+        if len(element._data["ownedElement"]) > 1
+    ]
+    # when names are repeated, the last item with the name is found
+    names = [
+        {item._data["name"]: item for item in items if "name" in item._data}
+        for items in owned
+    ]
+    barrier = Barrier(THREADS)
+
+    def look_up(_):
+        barrier.wait()
+        return all(
+            items[name] is item
+            for items, named in zip(owned, names)
+            for name, item in named.items()
+        )
+
+    for _ in range(20):
+        # the names are indexed again, by every thread at once
+        for items in owned:
+            items.__dict__.pop("_names", None)
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            assert all(executor.map(look_up, range(THREADS)))
+
+
+def test_instances_from_many_threads(kerbal_client, frequent_switches):
+    model = kerbal_client.model.seal()
+    elements = list(model.elements.values())[:10]
+
+    def instantiate(_):
+        return [Instance(element) for element in elements for _ in range(100)]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        instances = sum(executor.map(instantiate, range(THREADS)), [])
+    assert len(instances) == len(elements) * 100 * THREADS
+
+    for element in elements:
+        names = [instance.name for instance in element._instances]
+        assert len(names) == len(set(names)) == 100 * THREADS